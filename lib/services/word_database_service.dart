@@ -143,7 +143,31 @@ class WordDatabaseService {
     }
   }
 
+  /// Firestore rejects batches with more than 500 writes
+  static const int _maxBatchWrites = 500;
+
+  static final RegExp _docIdSafeChar = RegExp(r'[a-z0-9-]');
+
+  /// Stable document ID for a word, the same as word_doc_id in
+  /// scripts/upload_to_firebase.py: the trimmed, lowercased word with any
+  /// character outside a-z, 0-9 and '-' written as ~ and six hex digits.
+  static String wordDocId(String word) {
+    final buffer = StringBuffer();
+    for (final rune in word.trim().toLowerCase().runes) {
+      final char = String.fromCharCode(rune);
+      if (_docIdSafeChar.hasMatch(char)) {
+        buffer.write(char);
+      } else {
+        buffer.write('~${rune.toRadixString(16).padLeft(6, '0')}');
+      }
+    }
+    return buffer.toString();
+  }
+
   /// Sync words from JSON to Firestore
+  ///
+  /// Words are upserted into word-keyed documents, and only documents that
+  /// no longer match a word (old auto-ID copies, removed words) are deleted.
   static Future<void> syncWordsToFirestore() async {
     try {
       if (!FirebaseService.isInitialized) {
@@ -153,24 +177,55 @@ class WordDatabaseService {
 
       final List<Word> words = await loadWordsFromJson();
       final FirebaseFirestore firestore = FirebaseService.firestore;
-
-      // Clear existing words collection
-      final QuerySnapshot existingWords =
-          await firestore.collection('words').get();
-      final WriteBatch batch = firestore.batch();
-
-      for (var doc in existingWords.docs) {
-        batch.delete(doc.reference);
+      final CollectionReference collection = firestore.collection('words');
+
+      final Map<String, Word> wanted = {
+        for (final word in words) wordDocId(word.correctSpelling): word,
+      };
+
+      // Remove documents that are not keyed by one of the current words
+      final QuerySnapshot existingWords = await collection.get();
+      final List<DocumentReference> stale =
+          existingWords.docs
+              .where((doc) => doc.id != '_init' && !wanted.containsKey(doc.id))
+              .map((doc) => doc.reference)
+              .toList();
+
+      final List<Future<void>> commits = [];
+      WriteBatch batch = firestore.batch();
+      int pending = 0;
+
+      void addWrite(void Function(WriteBatch batch) write) {
+        write(batch);
+        pending++;
+        if (pending == _maxBatchWrites) {
+          commits.add(batch.commit());
+          batch = firestore.batch();
+          pending = 0;
+        }
       }
 
-      // Add new words from JSON
-      for (Word word in words) {
-        final docRef = firestore.collection('words').doc();
-        batch.set(docRef, word.toJson());
+      for (final entry in wanted.entries) {
+        addWrite(
+          (batch) => batch.set(
+            collection.doc(entry.key),
+            entry.value.toJson(),
+            SetOptions(merge: true),
+          ),
+        );
+      }
+      for (final reference in stale) {
+        addWrite((batch) => batch.delete(reference));
+      }
+      if (pending > 0) {
+        commits.add(batch.commit());
       }
 
-      await batch.commit();
-      print('Successfully synced ${words.length} words to Firestore');
+      await Future.wait(commits);
+      print(
+        'Successfully synced ${wanted.length} words to Firestore '
+        '(${stale.length} stale documents removed)',
+      );
     } catch (e) {
       print('Error syncing words to Firestore: $e');
       rethrow;
@@ -1,4 +1,6 @@
+import 'dart:convert';
 import 'dart:math';
+import 'package:flutter/services.dart';
 import '../models/word.dart';
 import 'word_database_service.dart';
 
@@ -7,6 +9,12 @@ class WordService {
 
   /// Get daily words based on current date - everyone gets the same words on the same day
   static Future<List<Word>> getDailyWords(DateTime date) async {
+    // Use the precomputed schedule when it covers this date
+    final scheduledWords = await _loadScheduledWords(date);
+    if (scheduledWords != null) {
+      return scheduledWords;
+    }
+
     // Create a deterministic seed based on the date
     final seed = _createDateSeed(date);
     final seededRandom = Random(seed);
@@ -44,6 +52,29 @@ class WordService {
     return dailyWords;
   }
 
+  /// Load the words scheduled for a date by scripts/build_daily_schedule.py,
+  /// or null if the schedule asset is missing or does not cover the date
+  static Future<List<Word>?> _loadScheduledWords(DateTime date) async {
+    try {
+      final String jsonString = await rootBundle.loadString(
+        'assets/data/daily_schedule.json',
+      );
+      final Map<String, dynamic> schedule = json.decode(jsonString);
+      final String key =
+          '${date.year.toString().padLeft(4, '0')}-'
+          '${date.month.toString().padLeft(2, '0')}-'
+          '${date.day.toString().padLeft(2, '0')}';
+      final List<dynamic>? words = schedule['days']?[key];
+      if (words == null || words.isEmpty) {
+        return null;
+      }
+      return words.map((word) => Word.fromJson(word)).toList();
+    } catch (e) {
+      print('No daily schedule for ${date.year}-${date.month}-${date.day}: $e');
+      return null;
+    }
+  }
+
   /// Create a deterministic seed from a date
   static int _createDateSeed(DateTime date) {
     // Convert date to a unique integer seed
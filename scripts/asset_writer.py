@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Single output path for every asset the word pipeline writes.
+
+JSON is written with compact separators (unless pretty printing is asked
+for), every file goes through a temporary file in the same directory and is
+renamed into place, so a crash never leaves a half-written asset, and each
+write reports how much the file grew or shrank.
+
+Precompressed .gz/.br siblings can be written next to an asset for static
+hosting. Pick them with --compress, or MISPELT_ASSET_COMPRESS (for example
+"gz,br") for the whole pipeline. Siblings that already exist are always
+rewritten so they never go stale. Brotli needs the optional brotli package.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_ENV_VAR = 'MISPELT_ASSET_COMPRESS'
+COMPRESSIONS = ('gz', 'br')
+
+def _gzip(data):
+    # mtime=0 keeps the output byte-identical between runs
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+COMPRESSORS = {
+    'gz': _gzip,
+    'br': _brotli,
+}
+
+def _format_size(size):
+    return f"{size / 1024:.1f} KB" if size >= 1024 else f"{size} B"
+
+def _format_delta(old_size, new_size):
+    if old_size is None:
+        return f"{_format_size(new_size)} (new)"
+    delta = new_size - old_size
+    percent = f", {delta / old_size:+.1%}" if old_size else ""
+    return f"{_format_size(old_size)} → {_format_size(new_size)} ({delta:+d} B{percent})"
+
+def _current_umask():
+    # os.umask can only be read by setting it
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+def atomic_write(path, data):
+    """
+    Write bytes to path through a temporary file and a rename.
+
+    Returns the previous size of the file, or None if it did not exist.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    try:
+        stat = os.stat(path)
+        old_size, mode = stat.st_size, stat.st_mode & 0o7777
+    except OSError:
+        old_size, mode = None, 0o666 & ~_current_umask()
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        # mkstemp creates the file as 0600; give it the permissions the
+        # asset had (or a new file would get) before it is renamed into place
+        os.chmod(temp_path, mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    return old_size
+
+class AssetWriter:
+    """
+    Writes JSON and binary assets atomically, with optional precompressed siblings
+    """
+
+    def __init__(self, compress=(), pretty=False, quiet=False):
+        for name in compress:
+            if name not in COMPRESSORS:
+                raise ValueError(f"Unknown compression '{name}', expected one of {COMPRESSIONS}")
+        if 'br' in compress and brotli is None:
+            print("⚠️ Warning: brotli is not installed, skipping .br outputs")
+            compress = tuple(name for name in compress if name != 'br')
+        self.compress = tuple(compress)
+        self.pretty = pretty
+        self.quiet = quiet
+        self.bytes_before = 0
+        self.bytes_after = 0
+
+    def encode_json(self, data):
+        if self.pretty:
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        return text.encode('utf-8')
+
+    def write_json(self, path, data, compress=None):
+        """
+        Write data as a JSON asset; returns the number of bytes written
+        """
+        return self.write_bytes(path, self.encode_json(data), compress)
+
+    def write_bytes(self, path, data, compress=None):
+        """
+        Write a binary asset; returns the number of bytes written.
+
+        compress overrides the writer's compressions for this file (pass ()
+        for backups and other files that are never served).
+        """
+        old_size = atomic_write(path, data)
+        self._report(path, old_size, len(data))
+
+        wanted = self.compress if compress is None else tuple(compress)
+        for name, compressor in COMPRESSORS.items():
+            sibling = f"{path}.{name}"
+            if name not in wanted and not os.path.exists(sibling):
+                continue
+            if name == 'br' and brotli is None:
+                print(f"⚠️ Warning: {sibling} is stale, brotli is not installed to rewrite it")
+                continue
+            packed = compressor(data)
+            self._report(sibling, atomic_write(sibling, packed), len(packed))
+        return len(data)
+
+    def _report(self, path, old_size, new_size):
+        self.bytes_before += old_size or 0
+        self.bytes_after += new_size
+        if not self.quiet:
+            print(f"💾 {path}: {_format_delta(old_size, new_size)}")
+
+    def print_summary(self):
+        print(f"💾 Assets written: {_format_delta(self.bytes_before, self.bytes_after)}")
+
+def resolve_compress(compress=None):
+    """
+    Return the --compress choices, falling back to MISPELT_ASSET_COMPRESS
+    """
+    if compress:
+        return tuple(compress)
+    env_value = os.environ.get(COMPRESS_ENV_VAR, '')
+    return tuple(name.strip() for name in env_value.split(',') if name.strip())
+
+def add_output_arguments(parser):
+    """
+    Add the shared asset output options to an argparse parser
+    """
+    parser.add_argument('--compress', action='append', choices=COMPRESSIONS, default=None,
+                        help=f"Also write precompressed siblings (repeatable, defaults to ${COMPRESS_ENV_VAR})")
+    parser.add_argument('--pretty', action='store_true',
+                        help="Indent JSON assets instead of writing them compactly")
+
+def writer_from_args(args):
+    """
+    Build an AssetWriter from the options added by add_output_arguments
+    """
+    return AssetWriter(resolve_compress(args.compress), args.pretty)
+
+DEFAULT_WRITER = AssetWriter()
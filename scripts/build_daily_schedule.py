@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Precompute the daily challenge words for the next N days.
+
+Each day gets the same number of words from every level (2 per level for
+the usual 10), ordered from easiest to hardest, and no word comes back
+within --window days. Days that were already published in the schedule
+asset are kept as they are, so rerunning the job only fills in new days.
+
+The schedule is written as a small dated asset (assets/data/daily_schedule.json)
+and, with --firestore, as dailyGames/{YYYY-MM-DD} documents, so the app
+can fetch one day's 10 words instead of loading and shuffling every level.
+"""
+
+import argparse
+import json
+from datetime import date, timedelta
+
+from asset_writer import add_output_arguments, writer_from_args
+from pipeline_seed import add_seed_argument, resolve_seed, word_rng
+
+SCHEDULE_FILE = 'assets/data/daily_schedule.json'
+LEVEL_FILE = 'assets/data/words_level{level}.json'
+LEVELS = range(1, 6)
+
+WORDS_PER_DAY = 10
+DEFAULT_DAYS = 30
+DEFAULT_WINDOW = 21
+
+def load_level_words():
+    """
+    Return {level: [word objects]} from the level files the app reads
+    """
+    levels = {}
+    for level in LEVELS:
+        path = LEVEL_FILE.format(level=level)
+        with open(path, 'r', encoding='utf-8') as f:
+            words = json.load(f).get('words', [])
+        levels[level] = [w for w in words if w.get('correctSpelling') and w.get('misspellings')]
+    return levels
+
+def load_schedule(path):
+    """
+    Return {date string: [word objects]} from an existing schedule asset
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('days', {})
+    except (OSError, ValueError):
+        return {}
+
+def level_quotas(words_per_day, levels):
+    """
+    Split the daily word count as evenly as possible, easier levels first
+    """
+    levels = list(levels)
+    base, extra = divmod(words_per_day, len(levels))
+    return {level: base + (1 if i < extra else 0) for i, level in enumerate(levels)}
+
+def pick_day(day, levels, quotas, last_used, window, seed):
+    """
+    Pick one day's words: quotas[level] words per level, none used in the
+    last window days (falling back to the least recently used ones)
+    """
+    rng = word_rng(seed, 'daily', day.isoformat())
+    picked = []
+    for level, quota in quotas.items():
+        candidates = levels.get(level, [])
+        fresh = []
+        stale = []
+        for word in candidates:
+            last = last_used.get(word['correctSpelling'].lower(), date.min)
+            (fresh if (day - last).days > window else stale).append(word)
+        if len(fresh) >= quota:
+            chosen = rng.sample(fresh, quota)
+        else:
+            # Not enough words for the window: reuse the ones seen longest ago
+            stale.sort(key=lambda w: last_used[w['correctSpelling'].lower()])
+            chosen = fresh + stale[:quota - len(fresh)]
+        picked.extend(chosen)
+    return picked
+
+def build_schedule(levels, start, days, window=DEFAULT_WINDOW, words_per_day=WORDS_PER_DAY,
+                   seed=None, existing=None):
+    """
+    Return {date string: [word objects]} for days starting at start.
+
+    Days present in existing are kept, and existing days before start
+    still count toward the no-repeat window.
+    """
+    existing = existing or {}
+    quotas = level_quotas(words_per_day, LEVELS)
+    last_used = {}
+    for day_string in sorted(existing):
+        if day_string < start.isoformat():
+            for word in existing[day_string]:
+                last_used[word['correctSpelling'].lower()] = date.fromisoformat(day_string)
+
+    schedule = {}
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        words = existing.get(day.isoformat())
+        if words is None:
+            words = sorted(pick_day(day, levels, quotas, last_used, window, seed),
+                           key=lambda w: w.get('difficulty', 0))
+        schedule[day.isoformat()] = words
+        for word in words:
+            last_used[word['correctSpelling'].lower()] = day
+    return schedule
+
+def count_repeats(schedule, window):
+    """
+    Count words scheduled again within window days of their last use
+    """
+    last_used = {}
+    repeats = 0
+    for day_string in sorted(schedule):
+        day = date.fromisoformat(day_string)
+        for word in schedule[day_string]:
+            key = word['correctSpelling'].lower()
+            if key in last_used and (day - last_used[key]).days <= window:
+                repeats += 1
+            last_used[key] = day
+    return repeats
+
+def publish_to_firestore(schedule, emulator=None):
+    """
+    Write each day as a dailyGames/{date} document
+    """
+    try:
+        from upload_to_firebase import commit_in_chunks, connect_firestore
+    except ImportError:
+        print("❌ Firebase Admin SDK not found!")
+        print("Please install it with: pip install firebase-admin")
+        return False
+
+    db = connect_firestore(emulator)
+    if db is None:
+        return False
+    ops = [('set', day, {"date": day, "words": words}) for day, words in schedule.items()]
+    print(f"📤 Writing {len(ops)} dailyGames documents...")
+    failed = commit_in_chunks(db, ops, collection_name='dailyGames')
+    if failed:
+        print(f"❌ {len(failed)} batches failed; rerun to retry them")
+        return False
+    print("✅ Published the schedule to dailyGames")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the daily challenge schedule")
+    parser.add_argument('--days', type=int, default=DEFAULT_DAYS, help="How many days to schedule")
+    parser.add_argument('--start', default=None, help="First day (YYYY-MM-DD), defaults to today")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                        help="Days before a word may be used again")
+    parser.add_argument('--words-per-day', type=int, default=WORDS_PER_DAY)
+    parser.add_argument('--schedule', default=SCHEDULE_FILE, help="Schedule asset to update")
+    parser.add_argument('--regenerate', action='store_true',
+                        help="Ignore days already in the schedule asset")
+    parser.add_argument('--firestore', action='store_true',
+                        help="Also publish the days as dailyGames documents")
+    parser.add_argument('--emulator', default=None, metavar='HOST:PORT',
+                        help="Publish to the local Firestore emulator")
+    add_seed_argument(parser)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    seed = resolve_seed(args.seed)
+    start = date.fromisoformat(args.start) if args.start else date.today()
+
+    print("Daily Challenge Schedule Builder")
+    try:
+        levels = load_level_words()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error loading level files: {e}")
+        return
+    for level, words in levels.items():
+        print(f"Level {level}: {len(words)} words")
+
+    existing = {} if args.regenerate else load_schedule(args.schedule)
+    schedule = build_schedule(levels, start, args.days, args.window, args.words_per_day, seed, existing)
+    kept = sum(1 for day in schedule if day in existing)
+    print(f"📅 Scheduled {len(schedule)} days from {start.isoformat()} "
+          f"({kept} kept from the existing schedule)")
+    repeats = count_repeats(schedule, args.window)
+    if repeats:
+        print(f"⚠️ Warning: {repeats} words repeat within {args.window} days; "
+              f"some level has too few words for the window")
+
+    writer = writer_from_args(args)
+    writer.write_json(args.schedule, {
+        "start": start.isoformat(),
+        "wordsPerDay": args.words_per_day,
+        "days": schedule,
+    })
+
+    if args.firestore:
+        publish_to_firestore(schedule, args.emulator)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Check that words_level1..5.json and words_combined.json agree.
+
+The level files and the combined file are written by different scripts, so
+they drift apart. Every file is read once and every entry is indexed by
+word, so the whole check is O(total words) and cheap enough for a commit
+hook. With --repair, one side is rewritten from the other.
+
+Exits with status 1 when the files disagree (and were not repaired).
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from asset_writer import add_output_arguments, writer_from_args
+
+LEVELS = range(1, 6)
+LEVEL_FILE = 'assets/data/words_level{level}.json'
+COMBINED_FILE = 'assets/data/words_combined.json'
+
+# Fields that must match between a level entry and its combined entry
+COMPARED_FIELDS = ('correctSpelling', 'misspellings', 'difficulty', 'definition')
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class ConsistencyReport:
+    """
+    Divergence between the level files and the combined file
+    """
+
+    def __init__(self):
+        self.level_words = 0
+        self.combined_words = 0
+        # words only found on one side
+        self.missing_from_combined = []
+        self.missing_from_levels = []
+        # word -> level files it appears in
+        self.in_several_levels = {}
+        # word -> (level file, difficulty field) where they disagree
+        self.wrong_difficulty = {}
+        # word -> fields whose values differ between the two sides
+        self.field_mismatches = {}
+
+    def is_consistent(self):
+        return not (self.missing_from_combined or self.missing_from_levels or self.in_several_levels
+                    or self.wrong_difficulty or self.field_mismatches)
+
+    def print_summary(self, limit=10):
+        print(f"📖 {self.level_words} words in level files, {self.combined_words} in combined file")
+        sections = (
+            ("words missing from the combined file", self.missing_from_combined),
+            ("words missing from the level files", self.missing_from_levels),
+            ("words in more than one level file", self.in_several_levels),
+            ("words whose difficulty does not match their level file", self.wrong_difficulty),
+            ("words whose fields differ between the files", self.field_mismatches),
+        )
+        for label, found in sections:
+            if not found:
+                continue
+            print(f"❌ {len(found)} {label}:")
+            items = list(found.items()) if isinstance(found, dict) else [(word, None) for word in found]
+            for word, detail in items[:limit]:
+                print(f"   '{word}'" + (f": {detail}" if detail is not None else ""))
+            if len(items) > limit:
+                print(f"   ... and {len(items) - limit} more")
+
+def index_levels(level_data):
+    """
+    Map lowercase word -> (level, entry) over all level files.
+
+    Returns the index and {word: [levels]} for words found in several files.
+    """
+    index = {}
+    repeated = {}
+    for level, data in level_data.items():
+        for entry in data.get('words', []):
+            word = entry['correctSpelling'].lower()
+            if word in index:
+                repeated.setdefault(word, [index[word][0]]).append(level)
+            else:
+                index[word] = (level, entry)
+    return index, repeated
+
+def check(level_data, combined_data):
+    """
+    Compare the loaded level files with the loaded combined file
+    """
+    report = ConsistencyReport()
+    level_index, report.in_several_levels = index_levels(level_data)
+    report.level_words = sum(len(data.get('words', [])) for data in level_data.values())
+
+    combined = combined_data.get('words', [])
+    report.combined_words = len(combined)
+    seen = set()
+    for entry in combined:
+        word = entry['correctSpelling'].lower()
+        seen.add(word)
+        found = level_index.get(word)
+        if found is None:
+            report.missing_from_levels.append(word)
+            continue
+        level, level_entry = found
+        if level_entry.get('difficulty') != level:
+            report.wrong_difficulty[word] = (level, level_entry.get('difficulty'))
+        fields = [field for field in COMPARED_FIELDS if entry.get(field) != level_entry.get(field)]
+        if fields:
+            report.field_mismatches[word] = fields
+
+    report.missing_from_combined = [word for word in level_index if word not in seen]
+    return report
+
+def repair_levels_from_combined(level_data, combined_data):
+    """
+    Rewrite the level files from the combined file.
+
+    Words keep their position in their level file; words new to a level are
+    appended in combined order, and words no longer in the combined file
+    are dropped.
+    """
+    wanted = {level: {} for level in LEVELS}
+    for entry in combined_data.get('words', []):
+        level = entry.get('difficulty')
+        if level in wanted:
+            wanted[level][entry['correctSpelling'].lower()] = entry
+        else:
+            print(f"⚠️ Skipping '{entry['correctSpelling']}' with difficulty {level}")
+
+    for level in LEVELS:
+        entries = wanted[level]
+        words = []
+        for entry in level_data[level].get('words', []):
+            word = entry['correctSpelling'].lower()
+            if word in entries:
+                words.append(entries.pop(word))
+        words.extend(entries.values())
+        level_data[level]['words'] = words
+        level_data[level]['level'] = level
+        level_data[level]['count'] = len(words)
+
+def repair_combined_from_levels(level_data, combined_data):
+    """
+    Rewrite the combined file from the level files.
+
+    Words keep their position in the combined file, words new to it are
+    appended, and every difficulty is set to the level file it came from.
+    """
+    level_index, _ = index_levels(level_data)
+    words = []
+    for entry in combined_data.get('words', []):
+        found = level_index.pop(entry['correctSpelling'].lower(), None)
+        if found is not None:
+            level, level_entry = found
+            words.append(dict(level_entry, difficulty=level))
+    for level, level_entry in level_index.values():
+        words.append(dict(level_entry, difficulty=level))
+    combined_data['words'] = words
+    combined_data['total_count'] = len(words)
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the level files and words_combined.json agree")
+    parser.add_argument('--repair', choices=('levels', 'combined'), default=None,
+                        help="Rewrite the level files from the combined file ('levels') "
+                             "or the combined file from the level files ('combined')")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    writer = writer_from_args(args)
+
+    paths = {level: LEVEL_FILE.format(level=level) for level in LEVELS}
+    for path in list(paths.values()) + [COMBINED_FILE]:
+        if not os.path.exists(path):
+            print(f"❌ Error: {path} not found!")
+            sys.exit(1)
+
+    level_data = {level: load_json(path) for level, path in paths.items()}
+    combined_data = load_json(COMBINED_FILE)
+
+    report = check(level_data, combined_data)
+    report.print_summary()
+    if report.is_consistent():
+        print("✅ Level files and combined file are consistent")
+        return
+
+    if args.repair == 'levels':
+        repair_levels_from_combined(level_data, combined_data)
+        for level, path in paths.items():
+            writer.write_json(path, level_data[level])
+        print("🔧 Rewrote the level files from the combined file")
+    elif args.repair == 'combined':
+        repair_combined_from_levels(level_data, combined_data)
+        writer.write_json(COMBINED_FILE, combined_data)
+        print("🔧 Rewrote the combined file from the level files")
+    else:
+        print("⚠️  Files are inconsistent; rerun with --repair levels or --repair combined")
+        sys.exit(1)
+
+    report = check(level_data, combined_data)
+    if not report.is_consistent():
+        report.print_summary()
+        sys.exit(1)
+    print("✅ Level files and combined file are consistent")
+
+if __name__ == "__main__":
+    main()
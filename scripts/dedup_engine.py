@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Single-pass duplicate detection shared by remove_duplicates.py and
+validate_no_duplicates.py.
+
+One pass over the word list builds an index of correct spellings and of
+misspellings, and everything else is a dictionary join against that index:
+
+- misspellings that are also a correct spelling somewhere in the list
+- misspellings repeated within one word, like ['enviroment', 'enviroment']
+- correctSpelling entries that appear more than once (across levels or not)
+- misspellings shared between different words
+"""
+
+import json
+from typing import Dict, List, Tuple
+
+def load_words(file_path: str) -> Dict:
+    """Load words from JSON file."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"❌ Error loading {file_path}: {e}")
+        return {"words": []}
+
+class DuplicateReport:
+    """Everything one scan found, keyed by the words involved."""
+
+    def __init__(self):
+        self.total_words = 0
+        self.total_misspellings = 0
+        self.unique_correct_spellings = 0
+        # correctSpelling -> misspellings that are also correct spellings
+        self.conflicts: Dict[str, List[str]] = {}
+        # correctSpelling -> misspellings listed more than once
+        self.repeated: Dict[str, List[str]] = {}
+        # lowercase correctSpelling -> difficulty of every entry
+        self.duplicate_words: Dict[str, List] = {}
+        # lowercase misspelling -> correctSpellings that use it
+        self.shared: Dict[str, List[str]] = {}
+
+    @property
+    def total_conflicts(self) -> int:
+        return sum(len(found) for found in self.conflicts.values())
+
+    @property
+    def total_repeated(self) -> int:
+        return sum(len(found) for found in self.repeated.values())
+
+    def is_clean(self) -> bool:
+        """True when nothing needs fixing (shared misspellings are allowed)."""
+        return not (self.conflicts or self.repeated or self.duplicate_words)
+
+    def to_dict(self) -> Dict:
+        return {
+            "total_words": self.total_words,
+            "total_misspellings": self.total_misspellings,
+            "unique_correct_spellings": self.unique_correct_spellings,
+            "conflicts": self.conflicts,
+            "repeated_misspellings": self.repeated,
+            "duplicate_words": self.duplicate_words,
+            "shared_misspellings": self.shared,
+        }
+
+    def print_summary(self):
+        print(f"📖 Checked {self.total_words} words ({self.unique_correct_spellings} unique), "
+              f"{self.total_misspellings} misspellings")
+        if self.conflicts:
+            print(f"❌ {self.total_conflicts} misspellings are also correct spellings:")
+            for word, found in self.conflicts.items():
+                print(f"   '{word}': {found}")
+        if self.repeated:
+            print(f"❌ {self.total_repeated} misspellings are repeated within a word:")
+            for word, found in self.repeated.items():
+                print(f"   '{word}': {found}")
+        if self.duplicate_words:
+            print(f"❌ {len(self.duplicate_words)} correct spellings appear more than once:")
+            for word, levels in self.duplicate_words.items():
+                print(f"   '{word}' at difficulty {levels}")
+        if self.shared:
+            print(f"⚠️  {len(self.shared)} misspellings are shared between words:")
+            for misspelling, owners in self.shared.items():
+                print(f"   '{misspelling}': {owners}")
+
+def scan_words(words: List[Dict]) -> DuplicateReport:
+    """Build the duplicate report for a word list in a single pass."""
+    report = DuplicateReport()
+    correct_index: Dict[str, List] = {}
+    # lowercase misspelling -> (correctSpelling, misspelling) for every use
+    misspelling_index: Dict[str, List[Tuple[str, str]]] = {}
+
+    for word in words:
+        correct = word['correctSpelling']
+        correct_index.setdefault(correct.lower(), []).append(word.get('difficulty'))
+
+        seen = set()
+        for misspelling in word['misspellings']:
+            key = misspelling.lower()
+            if key in seen:
+                report.repeated.setdefault(correct, []).append(misspelling)
+                continue
+            seen.add(key)
+            misspelling_index.setdefault(key, []).append((correct, misspelling))
+        report.total_words += 1
+        report.total_misspellings += len(word['misspellings'])
+
+    report.unique_correct_spellings = len(correct_index)
+    report.duplicate_words = {word: levels for word, levels in correct_index.items() if len(levels) > 1}
+    for key, uses in misspelling_index.items():
+        owners = list(dict.fromkeys(owner for owner, _ in uses))
+        if len(owners) > 1:
+            report.shared[key] = owners
+        if key in correct_index:
+            for owner, misspelling in uses:
+                report.conflicts.setdefault(owner, []).append(misspelling)
+    return report
+
+def clean_words(words: List[Dict], report: DuplicateReport) -> int:
+    """
+    Drop conflicting and repeated misspellings in place, using a scan report.
+
+    Only the words named in the report are touched. Returns the number of
+    misspellings removed.
+    """
+    removed_count = 0
+    for word in words:
+        correct = word['correctSpelling']
+        if correct not in report.conflicts and correct not in report.repeated:
+            continue
+        conflicts = {m.lower() for m in report.conflicts.get(correct, ())}
+        kept = []
+        seen = set()
+        for misspelling in word['misspellings']:
+            key = misspelling.lower()
+            if key in conflicts or key in seen:
+                removed_count += 1
+            else:
+                seen.add(key)
+                kept.append(misspelling)
+        word['misspellings'] = kept
+    return removed_count
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Build and query a local definitions index from a bulk dictionary dump.
+
+The index is a single SQLite table keyed by lowercase word, so enriching
+thousands of words is one local batch join instead of thousands of API
+calls. Supported dump formats (plain or gzip):
+
+- WordNet database files (data.noun, data.verb, data.adj, data.adv)
+- Wiktionary-style JSON lines ({"word": ..., "senses": [{"glosses": [...]}]})
+- Tab-separated "word<TAB>definition" lines
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+
+from asset_writer import add_output_arguments, writer_from_args
+from parse_dictionary_better import open_dictionary
+
+DEFAULT_INDEX_FILE = '.cache/definitions.sqlite3'
+
+# SQLite limits the number of bound parameters per statement
+LOOKUP_CHUNK_SIZE = 500
+INSERT_CHUNK_SIZE = 5000
+
+# WordNet marks adjective positions like "able(a)"
+WORDNET_MARKER_RE = re.compile(r'\([a-z]+\)$')
+
+def detect_format(path):
+    """
+    Guess the dump format from its file name
+    """
+    name = os.path.basename(path).lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if name.startswith('data.'):
+        return 'wordnet'
+    if name.endswith('.jsonl') or name.endswith('.json'):
+        return 'jsonl'
+    return 'tsv'
+
+def _clean_definition(text):
+    text = text.strip()
+    if text:
+        text = text[0].upper() + text[1:]
+        if not text.endswith('.'):
+            text += '.'
+    return text
+
+def iter_wordnet(f):
+    """
+    Yield (word, definition) from a WordNet data.* file
+    """
+    for line in f:
+        # The license header lines start with spaces
+        if not line or line.startswith(' ') or '|' not in line:
+            continue
+        fields, _, gloss = line.partition('|')
+        parts = fields.split()
+        try:
+            word_count = int(parts[3], 16)
+        except (IndexError, ValueError):
+            continue
+        # Examples follow the definition after a semicolon
+        definition = _clean_definition(gloss.split(';')[0])
+        if not definition:
+            continue
+        for i in range(word_count):
+            index = 4 + i * 2
+            if index >= len(parts):
+                break
+            word = WORDNET_MARKER_RE.sub('', parts[index]).replace('_', ' ').lower()
+            yield word, definition
+
+def iter_jsonl(f):
+    """
+    Yield (word, definition) from Wiktionary-style JSON lines
+    """
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        word = str(entry.get('word', '')).strip().lower()
+        for sense in entry.get('senses', []):
+            glosses = sense.get('glosses') or []
+            if word and glosses:
+                yield word, _clean_definition(glosses[0])
+                break
+
+def iter_tsv(f):
+    """
+    Yield (word, definition) from "word<TAB>definition" lines
+    """
+    for line in f:
+        word, sep, definition = line.rstrip('\n').partition('\t')
+        definition = _clean_definition(definition)
+        if sep and word.strip() and definition:
+            yield word.strip().lower(), definition
+
+READERS = {
+    'wordnet': iter_wordnet,
+    'jsonl': iter_jsonl,
+    'tsv': iter_tsv,
+}
+
+class DefinitionsIndex:
+    """
+    SQLite-backed word -> definition index
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_FILE):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS definitions ("
+            " word TEXT PRIMARY KEY,"
+            " definition TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM definitions").fetchone()[0]
+
+    def ingest(self, pairs):
+        """
+        Insert (word, definition) pairs, keeping the first definition per word.
+
+        Returns the number of new words added.
+        """
+        before = len(self)
+        batch = []
+        with self._conn:
+            for pair in pairs:
+                batch.append(pair)
+                if len(batch) >= INSERT_CHUNK_SIZE:
+                    self._conn.executemany("INSERT OR IGNORE INTO definitions VALUES (?, ?)", batch)
+                    batch = []
+            if batch:
+                self._conn.executemany("INSERT OR IGNORE INTO definitions VALUES (?, ?)", batch)
+        return len(self) - before
+
+    def lookup_many(self, words):
+        """
+        Return {word: definition} for every indexed word in one batch join
+        """
+        unique = sorted({word.lower() for word in words})
+        found = {}
+        for i in range(0, len(unique), LOOKUP_CHUNK_SIZE):
+            chunk = unique[i:i + LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT word, definition FROM definitions WHERE word IN ({placeholders})", chunk
+            )
+            found.update(rows)
+        return found
+
+    def close(self):
+        self._conn.close()
+
+def enrich_words(words, index):
+    """
+    Fill empty definitions in word objects from the index; returns how many were filled
+    """
+    missing = [w for w in words if not w.get('definition') and w.get('correctSpelling')]
+    found = index.lookup_many(w['correctSpelling'] for w in missing)
+    filled = 0
+    for word_obj in missing:
+        definition = found.get(word_obj['correctSpelling'].lower())
+        if definition:
+            word_obj['definition'] = definition
+            filled += 1
+    return filled
+
+def build(args):
+    index = DefinitionsIndex(args.index)
+    for path in args.dumps:
+        if not os.path.exists(path):
+            print(f"❌ Error: {path} not found!")
+            continue
+        fmt = args.format or detect_format(path)
+        print(f"📖 Ingesting {path} ({fmt})...")
+        with open_dictionary(path) as f:
+            added = index.ingest(READERS[fmt](f))
+        print(f"✅ Added {added} words")
+    print(f"📚 Index {args.index} now holds {len(index)} definitions")
+    index.close()
+
+def enrich(args):
+    index = DefinitionsIndex(args.index)
+    writer = writer_from_args(args)
+    for path in args.files:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"❌ Error loading {path}: {e}")
+            continue
+        words = data.get('words', [])
+        filled = enrich_words(words, index)
+        missing = sum(1 for w in words if not w.get('definition'))
+        writer.write_json(path, data)
+        print(f"✅ {path}: filled {filled} definitions, {missing} still missing")
+    index.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local definitions index built from a bulk dictionary dump")
+    parser.add_argument('--index', default=DEFAULT_INDEX_FILE, help="SQLite index file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Ingest dump files into the index")
+    build_parser.add_argument('dumps', nargs='+', help="WordNet data.*, JSON lines, or TSV files (gzip ok)")
+    build_parser.add_argument('--format', choices=sorted(READERS), default=None,
+                              help="Dump format (guessed from the file name by default)")
+    build_parser.set_defaults(func=build)
+
+    enrich_parser = subparsers.add_parser('enrich', help="Fill empty definitions in word files")
+    enrich_parser.add_argument('files', nargs='*',
+                               default=[f'assets/data/words_level{level}.json' for level in range(1, 6)])
+    add_output_arguments(enrich_parser)
+    enrich_parser.set_defaults(func=enrich)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Feature-based difficulty scoring for candidate words.
+
+Length alone puts words like "maces" and "sinew" in the same level as every
+other 5-letter word. Instead, each candidate is scored from a few features
+computed over the whole candidate set at once:
+
+- length
+- letter rarity: mean -log frequency of the word's letters in the set
+- tricky spellings: how many phonetic digraphs and doubled letters from the
+  misspelling pattern tables it contains
+- closeness: how many plausible misspellings sit close to the word. Each
+  of its most plausible candidates from the misspelling engine adds its
+  plausibility weight divided by its edit distance from the word
+
+The standardized features are summed and levels are assigned by quantile, so
+every level gets the same share of candidates. NumPy is used when installed;
+otherwise the same scores are computed in plain Python, only slower.
+"""
+
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from improve_misspellings_better import DEFAULT_ENGINE, DOUBLE_PATTERNS, PHONETIC_PATTERNS
+
+LEVELS = 5
+
+# Sequences people commonly get wrong, taken from the misspelling patterns
+TRICKY_SEQUENCES = tuple(sorted(
+    {old for old, _ in PHONETIC_PATTERNS if len(old) >= 2}
+    | {new for _, new in DOUBLE_PATTERNS}
+    | {'ie', 'ei'}
+))
+
+# How many of the engine's most plausible misspellings closeness looks at
+CLOSENESS_CANDIDATES = 3
+
+FEATURE_WEIGHTS = {
+    'length': 1.0,
+    'rarity': 1.0,
+    'tricky': 0.75,
+    'closeness': 0.5,
+}
+
+def edit_distance(a, b):
+    """
+    Levenshtein distance between two strings
+    """
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def _candidate_chunk(words, k):
+    # Worker entry point: [(misspellings, weights)] for a chunk of words
+    result = []
+    for word in words:
+        candidates = list(itertools.islice(DEFAULT_ENGINE.iter_candidates(word), k))
+        result.append(([misspelling for misspelling, _, _ in candidates],
+                       [weight for _, weight, _ in candidates]))
+    return result
+
+def candidate_misspellings(words, k=CLOSENESS_CANDIDATES, workers=1):
+    """
+    Return (misspellings, plausibility weights) of the k most plausible
+    engine candidates of every word, generated in a process pool when
+    workers > 1
+    """
+    words = list(words)
+    if workers <= 1 or len(words) < 2:
+        pairs = _candidate_chunk(words, k)
+    else:
+        chunk_size = max(1, math.ceil(len(words) / (workers * 4)))
+        chunks = [words[i:i + chunk_size] for i in range(0, len(words), chunk_size)]
+        pairs = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk_result in executor.map(_candidate_chunk, chunks, itertools.repeat(k)):
+                pairs.extend(chunk_result)
+    return [ms for ms, _ in pairs], [ws for _, ws in pairs]
+
+def _closeness(words, misspellings, weights):
+    return [sum(weight / max(1, edit_distance(word, m)) for m, weight in zip(ms, ws))
+            for word, ms, ws in zip(words, misspellings, weights)]
+
+def _letter_rarity(words):
+    counts = {}
+    for word in words:
+        for char in word:
+            counts[char] = counts.get(char, 0) + 1
+    total = sum(counts.values())
+    rarity = {char: -math.log(count / total) for char, count in counts.items()}
+    return [sum(rarity[char] for char in word) / len(word) for word in words]
+
+def _python_features(words, misspellings, weights):
+    return {
+        'length': [float(len(word)) for word in words],
+        'rarity': _letter_rarity(words),
+        'tricky': [float(sum(seq in word for seq in TRICKY_SEQUENCES)) for word in words],
+        'closeness': _closeness(words, misspellings, weights),
+    }
+
+def _encode(words, width):
+    """
+    Pack words into an (n, width) uint8 matrix, zero padded
+    """
+    matrix = np.zeros((len(words), width), dtype=np.uint8)
+    if words:
+        joined = np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8)
+        lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        rows = np.repeat(np.arange(len(words)), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        matrix[rows, np.arange(len(joined)) - starts] = joined
+    return matrix
+
+def _batch_edit_distance(left, right):
+    """
+    Levenshtein distance for many (left[i], right[i]) pairs at once.
+
+    The dynamic programming table is filled cell by cell, but every step is
+    a vector operation over all pairs.
+    """
+    left_len = np.fromiter(map(len, left), dtype=np.int64, count=len(left))
+    right_len = np.fromiter(map(len, right), dtype=np.int64, count=len(right))
+    a = _encode(left, int(left_len.max()))
+    b = _encode(right, int(right_len.max()))
+    rows = np.arange(len(left))
+
+    previous = np.tile(np.arange(b.shape[1] + 1, dtype=np.int16), (len(left), 1))
+    distances = previous[rows, right_len].copy()
+    for i in range(1, a.shape[1] + 1):
+        current = np.empty_like(previous)
+        current[:, 0] = i
+        column = a[:, i - 1:i]
+        substitution = previous[:, :-1] + (column != b)
+        for j in range(1, b.shape[1] + 1):
+            current[:, j] = np.minimum(np.minimum(previous[:, j], current[:, j - 1]) + 1,
+                                       substitution[:, j - 1])
+        done = left_len == i
+        distances[done] = current[rows[done], right_len[done]]
+        previous = current
+    return distances
+
+def _numpy_features(words, misspellings, weights):
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    matrix = _encode(words, int(lengths.max()))
+    letters = matrix != 0
+
+    # Letter rarity from the frequencies over the whole candidate set
+    counts = np.bincount(matrix[letters], minlength=256).astype(np.float64)
+    table = np.zeros(256)
+    seen = counts > 0
+    table[seen] = -np.log(counts[seen] / counts.sum())
+    rarity = table[matrix].sum(axis=1) / lengths
+
+    # Tricky sequences, matched by comparing shifted columns
+    tricky = np.zeros(len(words))
+    for seq in TRICKY_SEQUENCES:
+        codes = seq.encode('ascii')
+        span = matrix.shape[1] - len(codes) + 1
+        if span <= 0:
+            continue
+        found = np.ones((len(words), span), dtype=bool)
+        for offset, code in enumerate(codes):
+            found &= matrix[:, offset:offset + span] == code
+        tricky += found.any(axis=1)
+
+    # Closeness, over all (word, misspelling) pairs in one batch
+    owners = [i for i, ms in enumerate(misspellings) for _ in ms]
+    closeness = np.zeros(len(words))
+    if owners:
+        distances = _batch_edit_distance([words[i] for i in owners],
+                                         [m for ms in misspellings for m in ms])
+        pair_weights = np.fromiter(itertools.chain.from_iterable(weights), dtype=np.float64,
+                                   count=len(owners))
+        np.add.at(closeness, np.array(owners), pair_weights / np.maximum(distances, 1))
+
+    return {
+        'length': lengths.astype(np.float64),
+        'rarity': rarity,
+        'tricky': tricky,
+        'closeness': closeness,
+    }
+
+def compute_features(words, misspellings=None, weights=None, workers=1):
+    """
+    Return {feature: values} for a list of lowercase ASCII words.
+
+    misspellings[i] lists the misspellings of words[i] and weights[i] their
+    plausibility (1.0 each when not given). By default they are the
+    engine's most plausible candidates (candidate_misspellings).
+    """
+    if misspellings is None:
+        misspellings, weights = candidate_misspellings(words, workers=workers)
+    elif weights is None:
+        weights = [[1.0] * len(ms) for ms in misspellings]
+    if np is not None and words:
+        return _numpy_features(words, misspellings, weights)
+    return _python_features(words, misspellings, weights)
+
+def _standardize(values):
+    mean = sum(values) / len(values)
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values))
+    return [(v - mean) / std if std else 0.0 for v in values]
+
+def difficulty_scores(words, misspellings=None, weights=None, feature_weights=FEATURE_WEIGHTS,
+                      workers=1):
+    """
+    Weighted sum of the standardized features; higher means harder
+    """
+    if not words:
+        return []
+    features = compute_features(words, misspellings, weights, workers)
+    if np is not None:
+        scores = np.zeros(len(words))
+        for name, weight in feature_weights.items():
+            values = features[name]
+            std = values.std()
+            if std:
+                scores += weight * (values - values.mean()) / std
+        return scores.tolist()
+
+    scores = [0.0] * len(words)
+    for name, weight in feature_weights.items():
+        for i, z in enumerate(_standardize(features[name])):
+            scores[i] += weight * z
+    return scores
+
+def assign_levels(scores, levels=LEVELS):
+    """
+    Split scores into equal-sized quantile levels 1..levels.
+
+    Ties keep their input order, so the result is deterministic.
+    """
+    count = len(scores)
+    if np is not None and count:
+        ranks = np.empty(count, dtype=np.int64)
+        ranks[np.argsort(np.asarray(scores), kind='stable')] = np.arange(count)
+        return (ranks * levels // count + 1).tolist()
+
+    result = [0] * count
+    for rank, i in enumerate(sorted(range(count), key=scores.__getitem__)):
+        result[i] = rank * levels // count + 1
+    return result
+
+def score_levels(words, misspellings=None, weights=None, levels=LEVELS, workers=1):
+    """
+    Return the quantile level of every word in a candidate set
+    """
+    return assign_levels(difficulty_scores(words, misspellings, weights, workers=workers), levels)
@@ -1,332 +1,619 @@
+import argparse
+import hashlib
+import heapq
+import itertools
 import json
+import math
+import os
 import random
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def generate_realistic_misspellings(word, difficulty):
+from asset_writer import DEFAULT_WRITER, add_output_arguments, atomic_write, writer_from_args
+from local_lexicon import load_backend
+from pipeline_seed import add_seed_argument, resolve_seed, word_rng
+
+# Content hashes of the words whose misspellings were last generated
+MANIFEST_FILE = '.cache/misspellings_manifest.json'
+
+# Misspellings that turn out to be real words are rejected against this list
+LEXICON_FILE = 'assets/data/words_dictionary.json'
+
+# REAL common misspellings that people actually make
+COMMON_MISSPELLINGS = {
+    # Very common mistakes
+    'beautiful': ['beutiful', 'beautifull'],
+    'definitely': ['definately', 'definatly'],
+    'separate': ['seperate', 'seperat'],
+    'receive': ['recieve', 'receeve'],
+    'believe': ['beleive', 'belive'],
+    'achieve': ['acheive', 'acheeve'],
+    'because': ['becuase', 'beacuse'],
+    'friend': ['freind', 'frend'],
+    'business': ['buisness', 'busness'],
+    'government': ['goverment', 'govermant'],
+    'environment': ['enviroment', 'enviroment'],
+    'necessary': ['neccessary', 'necesary'],
+    'occasionally': ['ocassionally', 'ocasionally'],
+    'successful': ['sucessful', 'succesful'],
+    'embarrass': ['embarass', 'embarras'],
+    'accommodate': ['accomodate', 'accomadate'],
+    'recommend': ['reccomend', 'recomend'],
+    'occurred': ['occured', 'ocurred'],
+    'privilege': ['priviledge', 'privilige'],
+    'maintenance': ['maintainance', 'maintenence'],
+    'conscious': ['concious', 'consious'],
+    'apparent': ['apparant', 'apparrent'],
+    'argument': ['arguement', 'arguement'],
+    'calendar': ['calender', 'calandar'],
+    'category': ['catagory', 'catagory'],
+    'cemetery': ['cemetary', 'cemetary'],
+    'changeable': ['changable', 'changable'],
+    'colleague': ['collegue', 'collegue'],
+    'committed': ['comitted', 'comitted'],
+    'committee': ['comittee', 'comittee'],
+    'competition': ['compitition', 'compitition'],
+    'convenient': ['convinient', 'convinient'],
+    'criticism': ['criticisim', 'criticisim'],
+    'curiosity': ['curiousity', 'curiousity'],
+    'desperate': ['desparate', 'desparate'],
+    'dictionary': ['dictionery', 'dictionery'],
+    'disappear': ['dissapear', 'dissapear'],
+    'exaggerate': ['exagerate', 'exagerate'],
+    'excellent': ['excelent', 'excelent'],
+    'existence': ['existance', 'existance'],
+    'experience': ['experiance', 'experiance'],
+    'familiar': ['familier', 'familier'],
+    'fascinating': ['fasinating', 'fasinating'],
+    'finally': ['finaly', 'finaly'],
+    'foreign': ['foriegn', 'foriegn'],
+    'foreseeable': ['forseeable', 'forseeable'],
+    'forty': ['fourty', 'fourty'],
+    'forward': ['forword', 'forword'],
+    'further': ['farther', 'farther'],
+    'grateful': ['greatful', 'greatful'],
+    'guarantee': ['gaurantee', 'gaurantee'],
+    'guard': ['gaurd', 'gaurd'],
+    'guidance': ['guidence', 'guidence'],
+    'happened': ['happend', 'happend'],
+    'harass': ['harrass', 'harrass'],
+    'height': ['hieght', 'hieght'],
+    'immediately': ['immediatly', 'immediatly'],
+    'independent': ['independant', 'independant'],
+    'intelligent': ['intellegent', 'intellegent'],
+    'interest': ['intrest', 'intrest'],
+    'interrupt': ['interupt', 'interupt'],
+    'irresistible': ['irresistable', 'irresistable'],
+    'knowledge': ['knowlege', 'knowlege'],
+    'library': ['libary', 'libary'],
+    'lightning': ['lightening', 'lightening'],
+    'lonely': ['lonly', 'lonly'],
+    'lose': ['loose', 'loose'],
+    'mathematics': ['mathmatics', 'mathmatics'],
+    'medicine': ['medecine', 'medecine'],
+    'million': ['milion', 'milion'],
+    'minute': ['minuet', 'minuet'],
+    'miscellaneous': ['miscellanious', 'miscellanious'],
+    'misspell': ['mispell', 'mispell'],
+    'neighbor': ['neighbour', 'neighbour'],
+    'noticeable': ['noticable', 'noticable'],
+    'occasion': ['ocassion', 'ocassion'],
+    'official': ['offical', 'offical'],
+    'opinion': ['opion', 'opion'],
+    'opportunity': ['oppertunity', 'oppertunity'],
+    'optimistic': ['optimisic', 'optimisic'],
+    'original': ['orignal', 'orignal'],
+    'parallel': ['paralell', 'paralell'],
+    'particular': ['particualr', 'particualr'],
+    'perceive': ['percieve', 'percieve'],
+    'performance': ['performence', 'performence'],
+    'permanent': ['permanant', 'permanant'],
+    'personal': ['personel', 'personel'],
+    'personnel': ['personel', 'personel'],
+    'physical': ['phisical', 'phisical'],
+    'piece': ['peice', 'peice'],
+    'pleasant': ['plesant', 'plesant'],
+    'politician': ['politican', 'politican'],
+    'position': ['posistion', 'posistion'],
+    'possible': ['posible', 'posible'],
+    'practical': ['practicle', 'practicle'],
+    'presence': ['presance', 'presance'],
+    'probably': ['probally', 'probally'],
+    'professional': ['profesional', 'profesional'],
+    'professor': ['professer', 'professer'],
+    'promise': ['promiss', 'promiss'],
+    'pronunciation': ['pronounciation', 'pronounciation'],
+    'purpose': ['purpous', 'purpous'],
+    'quantity': ['quantaty', 'quantaty'],
+    'questionnaire': ['questionaire', 'questionaire'],
+    'quiet': ['quite', 'quite'],
+    'quite': ['quiet', 'quiet'],
+    'really': ['realy', 'realy'],
+    'reference': ['referance', 'referance'],
+    'religion': ['religon', 'religon'],
+    'remember': ['rember', 'rember'],
+    'representative': ['representitive', 'representitive'],
+    'restaurant': ['resturant', 'resturant'],
+    'rhythm': ['rythm', 'rythm'],
+    'ridiculous': ['rediculous', 'rediculous'],
+    'safety': ['safty', 'safty'],
+    'schedule': ['scedule', 'scedule'],
+    'science': ['sience', 'sience'],
+    'secretary': ['secratary', 'secratary'],
+    'serious': ['sirius', 'sirius'],
+    'should': ['shold', 'shold'],
+    'sincerely': ['sincerly', 'sincerly'],
+    'soldier': ['solider', 'solider'],
+    'something': ['somthing', 'somthing'],
+    'sometimes': ['sometime', 'sometime'],
+    'sophomore': ['sophmore', 'sophmore'],
+    'succeed': ['suceed', 'suceed'],
+    'surprise': ['suprise', 'suprise'],
+    'temperature': ['temperture', 'temperture'],
+    'tendency': ['tendancy', 'tendancy'],
+    'therefore': ['therefor', 'therefor'],
+    'thorough': ['thorogh', 'thorogh'],
+    'thought': ['thot', 'thot'],
+    'through': ['thru', 'thru'],
+    'tired': ['tierd', 'tierd'],
+    'together': ['togather', 'togather'],
+    'tomorrow': ['tommorow', 'tommorow'],
+    'tongue': ['tounge', 'tounge'],
+    'truly': ['truely', 'truely'],
+    'unfortunately': ['unfortunatly', 'unfortunatly'],
+    'until': ['untill', 'untill'],
+    'usually': ['usualy', 'usualy'],
+    'vacuum': ['vaccum', 'vaccum'],
+    'valuable': ['valuble', 'valuble'],
+    'vegetable': ['vegtable', 'vegtable'],
+    'vehicle': ['vehical', 'vehical'],
+    'village': ['villige', 'villige'],
+    'weird': ['wierd', 'wierd'],
+    'whether': ['wether', 'wether'],
+    'which': ['wich', 'wich'],
+    'writing': ['writting', 'writting'],
+    'written': ['writen', 'writen'],
+    'wrong': ['rong', 'rong'],
+    'yield': ['yeild', 'yeild'],
+}
+
+# Phonetic substitutions
+PHONETIC_PATTERNS = [
+    ('ph', 'f'), ('c', 'k'), ('th', 'f'), ('qu', 'kw'), ('kw', 'qu'),
+    ('ch', 'sh'), ('wh', 'w'), ('kn', 'n'), ('wr', 'r'), ('mb', 'm'),
+    ('gh', 'h'), ('ck', 'k'), ('tch', 'ch'), ('dg', 'j'), ('ti', 'sh'),
+    ('ci', 'sh'), ('si', 'sh'), ('ss', 's'), ('ll', 'l'), ('ff', 'f'),
+    ('zz', 'z'), ('tt', 't'), ('pp', 'p'), ('bb', 'b'), ('dd', 'd'),
+    ('gg', 'g'), ('mm', 'm'), ('nn', 'n'), ('rr', 'r'), ('ss', 's')
+]
+
+# Vowel substitutions
+VOWEL_PATTERNS = [
+    ('a', 'e'), ('e', 'a'), ('i', 'y'), ('y', 'i'), ('o', 'u'), ('u', 'o'),
+    ('a', 'o'), ('e', 'i'), ('i', 'e'), ('o', 'a'), ('u', 'a'), ('y', 'e')
+]
+
+# Silent letter patterns
+SILENT_PATTERNS = [
+    ('b', ''), ('k', ''), ('w', ''), ('h', ''), ('l', ''), ('t', '')
+]
+
+# Double letter patterns
+DOUBLE_PATTERNS = [
+    ('b', 'bb'), ('c', 'cc'), ('d', 'dd'), ('f', 'ff'), ('g', 'gg'),
+    ('l', 'll'), ('m', 'mm'), ('n', 'nn'), ('p', 'pp'), ('r', 'rr'),
+    ('s', 'ss'), ('t', 'tt'), ('z', 'zz')
+]
+
+# Suffix patterns
+SUFFIX_PATTERNS = [
+    ('ing', 'in'), ('ed', 't'), ('er', 'a'), ('ly', 'ley'), ('ful', 'full'),
+    ('able', 'ible'), ('ible', 'able'), ('tion', 'shun'), ('sion', 'shun'),
+    ('ture', 'cher'), ('sure', 'sher'), ('ous', 'us'), ('ious', 'us'),
+    ('al', 'el'), ('el', 'al'), ('le', 'el'), ('el', 'le')
+]
+
+# Prefix patterns
+PREFIX_PATTERNS = [
+    ('un', 'in'), ('in', 'un'), ('dis', 'mis'), ('mis', 'dis'),
+    ('re', 'ri'), ('pre', 'pri'), ('pro', 'pra'), ('con', 'com'),
+    ('com', 'con'), ('en', 'in'), ('em', 'im')
+]
+
+# Letter transpositions (common typing errors)
+TRANSPOSITION_PATTERNS = [
+    ('th', 'ht'), ('er', 're'), ('te', 'et'), ('on', 'no'), ('an', 'na'),
+    ('st', 'ts'), ('ar', 'ra'), ('le', 'el'), ('se', 'es'), ('ne', 'en'),
+    ('at', 'ta'), ('it', 'ti'), ('is', 'si'), ('or', 'ro'), ('al', 'la'),
+    ('de', 'ed'), ('re', 'er'), ('we', 'ew'), ('me', 'em'), ('he', 'eh'),
+    ('as', 'sa'), ('in', 'ni'), ('to', 'ot'), ('of', 'fo'), ('be', 'eb')
+]
+
+# Letter additions/removals
+ADDITION_PATTERNS = [
+    ('', 'e'), ('', 'a'), ('', 'i'), ('', 'o'), ('', 'u'), ('', 'y'),
+    ('e', ''), ('a', ''), ('i', ''), ('o', ''), ('u', ''), ('y', '')
+]
+
+# ALL possible misspelling patterns with their types, in a fixed order
+ALL_PATTERNS = (
+    [('phonetic', old, new) for old, new in PHONETIC_PATTERNS]
+    + [('vowel', old, new) for old, new in VOWEL_PATTERNS]
+    + [('silent', old, new) for old, new in SILENT_PATTERNS]
+    + [('double', old, new) for old, new in DOUBLE_PATTERNS]
+    + [('suffix', old, new) for old, new in SUFFIX_PATTERNS]
+    + [('prefix', old, new) for old, new in PREFIX_PATTERNS]
+    + [('transpose', old, new) for old, new in TRANSPOSITION_PATTERNS]
+    + [('addition', old, new) for old, new in ADDITION_PATTERNS]
+)
+
+# How plausible each kind of edit is as a real human mistake (0-1)
+PATTERN_WEIGHTS = {
+    'common': 1.0,
+    'phonetic': 0.8,
+    'double': 0.75,
+    'vowel': 0.7,
+    'suffix': 0.65,
+    'silent': 0.6,
+    'prefix': 0.5,
+    'transpose': 0.45,
+    'addition': 0.3,
+}
+
+# People rarely get the first letter of a word wrong
+FIRST_LETTER_FACTOR = 0.5
+
+class MisspellingEngine:
     """
-    Generate realistic misspellings with RANDOM selection of patterns
+    Misspelling generator with every pattern table compiled once.
+
+    Rules are indexed by the substring they need (or the prefix/suffix they
+    match), so one scan over a word finds every applicable rule; rules that
+    cannot apply are skipped without any string searching.
+
+    With a lexicon (anything with a contains(word) method, such as a
+    local_lexicon.WordListBackend over the full source dictionary), candidates
+    that are themselves real words are rejected as they are generated.
     """
-    word = word.lower()
-    misspellings = []
-    
-    # REAL common misspellings that people actually make
-    common_misspellings = {
-        # Very common mistakes
-        'beautiful': ['beutiful', 'beautifull'],
-        'definitely': ['definately', 'definatly'],
-        'separate': ['seperate', 'seperat'],
-        'receive': ['recieve', 'receeve'],
-        'believe': ['beleive', 'belive'],
-        'achieve': ['acheive', 'acheeve'],
-        'because': ['becuase', 'beacuse'],
-        'friend': ['freind', 'frend'],
-        'business': ['buisness', 'busness'],
-        'government': ['goverment', 'govermant'],
-        'environment': ['enviroment', 'enviroment'],
-        'necessary': ['neccessary', 'necesary'],
-        'occasionally': ['ocassionally', 'ocasionally'],
-        'successful': ['sucessful', 'succesful'],
-        'embarrass': ['embarass', 'embarras'],
-        'accommodate': ['accomodate', 'accomadate'],
-        'recommend': ['reccomend', 'recomend'],
-        'occurred': ['occured', 'ocurred'],
-        'privilege': ['priviledge', 'privilige'],
-        'maintenance': ['maintainance', 'maintenence'],
-        'conscious': ['concious', 'consious'],
-        'apparent': ['apparant', 'apparrent'],
-        'argument': ['arguement', 'arguement'],
-        'calendar': ['calender', 'calandar'],
-        'category': ['catagory', 'catagory'],
-        'cemetery': ['cemetary', 'cemetary'],
-        'changeable': ['changable', 'changable'],
-        'colleague': ['collegue', 'collegue'],
-        'committed': ['comitted', 'comitted'],
-        'committee': ['comittee', 'comittee'],
-        'competition': ['compitition', 'compitition'],
-        'convenient': ['convinient', 'convinient'],
-        'criticism': ['criticisim', 'criticisim'],
-        'curiosity': ['curiousity', 'curiousity'],
-        'desperate': ['desparate', 'desparate'],
-        'dictionary': ['dictionery', 'dictionery'],
-        'disappear': ['dissapear', 'dissapear'],
-        'exaggerate': ['exagerate', 'exagerate'],
-        'excellent': ['excelent', 'excelent'],
-        'existence': ['existance', 'existance'],
-        'experience': ['experiance', 'experiance'],
-        'familiar': ['familier', 'familier'],
-        'fascinating': ['fasinating', 'fasinating'],
-        'finally': ['finaly', 'finaly'],
-        'foreign': ['foriegn', 'foriegn'],
-        'foreseeable': ['forseeable', 'forseeable'],
-        'forty': ['fourty', 'fourty'],
-        'forward': ['forword', 'forword'],
-        'further': ['farther', 'farther'],
-        'grateful': ['greatful', 'greatful'],
-        'guarantee': ['gaurantee', 'gaurantee'],
-        'guard': ['gaurd', 'gaurd'],
-        'guidance': ['guidence', 'guidence'],
-        'happened': ['happend', 'happend'],
-        'harass': ['harrass', 'harrass'],
-        'height': ['hieght', 'hieght'],
-        'immediately': ['immediatly', 'immediatly'],
-        'independent': ['independant', 'independant'],
-        'intelligent': ['intellegent', 'intellegent'],
-        'interest': ['intrest', 'intrest'],
-        'interrupt': ['interupt', 'interupt'],
-        'irresistible': ['irresistable', 'irresistable'],
-        'knowledge': ['knowlege', 'knowlege'],
-        'library': ['libary', 'libary'],
-        'lightning': ['lightening', 'lightening'],
-        'lonely': ['lonly', 'lonly'],
-        'lose': ['loose', 'loose'],
-        'mathematics': ['mathmatics', 'mathmatics'],
-        'medicine': ['medecine', 'medecine'],
-        'million': ['milion', 'milion'],
-        'minute': ['minuet', 'minuet'],
-        'miscellaneous': ['miscellanious', 'miscellanious'],
-        'misspell': ['mispell', 'mispell'],
-        'neighbor': ['neighbour', 'neighbour'],
-        'noticeable': ['noticable', 'noticable'],
-        'occasion': ['ocassion', 'ocassion'],
-        'official': ['offical', 'offical'],
-        'opinion': ['opion', 'opion'],
-        'opportunity': ['oppertunity', 'oppertunity'],
-        'optimistic': ['optimisic', 'optimisic'],
-        'original': ['orignal', 'orignal'],
-        'parallel': ['paralell', 'paralell'],
-        'particular': ['particualr', 'particualr'],
-        'perceive': ['percieve', 'percieve'],
-        'performance': ['performence', 'performence'],
-        'permanent': ['permanant', 'permanant'],
-        'personal': ['personel', 'personel'],
-        'personnel': ['personel', 'personel'],
-        'physical': ['phisical', 'phisical'],
-        'piece': ['peice', 'peice'],
-        'pleasant': ['plesant', 'plesant'],
-        'politician': ['politican', 'politican'],
-        'position': ['posistion', 'posistion'],
-        'possible': ['posible', 'posible'],
-        'practical': ['practicle', 'practicle'],
-        'presence': ['presance', 'presance'],
-        'probably': ['probally', 'probally'],
-        'professional': ['profesional', 'profesional'],
-        'professor': ['professer', 'professer'],
-        'promise': ['promiss', 'promiss'],
-        'pronunciation': ['pronounciation', 'pronounciation'],
-        'purpose': ['purpous', 'purpous'],
-        'quantity': ['quantaty', 'quantaty'],
-        'questionnaire': ['questionaire', 'questionaire'],
-        'quiet': ['quite', 'quite'],
-        'quite': ['quiet', 'quiet'],
-        'really': ['realy', 'realy'],
-        'reference': ['referance', 'referance'],
-        'religion': ['religon', 'religon'],
-        'remember': ['rember', 'rember'],
-        'representative': ['representitive', 'representitive'],
-        'restaurant': ['resturant', 'resturant'],
-        'rhythm': ['rythm', 'rythm'],
-        'ridiculous': ['rediculous', 'rediculous'],
-        'safety': ['safty', 'safty'],
-        'schedule': ['scedule', 'scedule'],
-        'science': ['sience', 'sience'],
-        'secretary': ['secratary', 'secratary'],
-        'serious': ['sirius', 'sirius'],
-        'should': ['shold', 'shold'],
-        'sincerely': ['sincerly', 'sincerly'],
-        'soldier': ['solider', 'solider'],
-        'something': ['somthing', 'somthing'],
-        'sometimes': ['sometime', 'sometime'],
-        'sophomore': ['sophmore', 'sophmore'],
-        'succeed': ['suceed', 'suceed'],
-        'surprise': ['suprise', 'suprise'],
-        'temperature': ['temperture', 'temperture'],
-        'tendency': ['tendancy', 'tendancy'],
-        'therefore': ['therefor', 'therefor'],
-        'thorough': ['thorogh', 'thorogh'],
-        'thought': ['thot', 'thot'],
-        'through': ['thru', 'thru'],
-        'tired': ['tierd', 'tierd'],
-        'together': ['togather', 'togather'],
-        'tomorrow': ['tommorow', 'tommorow'],
-        'tongue': ['tounge', 'tounge'],
-        'truly': ['truely', 'truely'],
-        'unfortunately': ['unfortunatly', 'unfortunatly'],
-        'until': ['untill', 'untill'],
-        'usually': ['usualy', 'usualy'],
-        'vacuum': ['vaccum', 'vaccum'],
-        'valuable': ['valuble', 'valuble'],
-        'vegetable': ['vegtable', 'vegtable'],
-        'vehicle': ['vehical', 'vehical'],
-        'village': ['villige', 'villige'],
-        'weird': ['wierd', 'wierd'],
-        'whether': ['wether', 'wether'],
-        'which': ['wich', 'wich'],
-        'writing': ['writting', 'writting'],
-        'written': ['writen', 'writen'],
-        'wrong': ['rong', 'rong'],
-        'yield': ['yeild', 'yeild'],
-    }
-    
-    # Check for exact common misspellings first
-    if word in common_misspellings:
-        misspellings.extend(common_misspellings[word])
-        return misspellings[:2]  # Return early for common words
-    
-    # ALL possible misspelling patterns (much more comprehensive)
-    all_patterns = []
-    
-    # Phonetic substitutions
-    phonetic_patterns = [
-        ('ph', 'f'), ('c', 'k'), ('th', 'f'), ('qu', 'kw'), ('kw', 'qu'),
-        ('ch', 'sh'), ('wh', 'w'), ('kn', 'n'), ('wr', 'r'), ('mb', 'm'),
-        ('gh', 'h'), ('ck', 'k'), ('tch', 'ch'), ('dg', 'j'), ('ti', 'sh'),
-        ('ci', 'sh'), ('si', 'sh'), ('ss', 's'), ('ll', 'l'), ('ff', 'f'),
-        ('zz', 'z'), ('tt', 't'), ('pp', 'p'), ('bb', 'b'), ('dd', 'd'),
-        ('gg', 'g'), ('mm', 'm'), ('nn', 'n'), ('rr', 'r'), ('ss', 's')
-    ]
-    
-    # Vowel substitutions
-    vowel_patterns = [
-        ('a', 'e'), ('e', 'a'), ('i', 'y'), ('y', 'i'), ('o', 'u'), ('u', 'o'),
-        ('a', 'o'), ('e', 'i'), ('i', 'e'), ('o', 'a'), ('u', 'a'), ('y', 'e')
-    ]
-    
-    # Silent letter patterns
-    silent_patterns = [
-        ('b', ''), ('k', ''), ('w', ''), ('h', ''), ('l', ''), ('t', '')
-    ]
-    
-    # Double letter patterns
-    double_patterns = [
-        ('b', 'bb'), ('c', 'cc'), ('d', 'dd'), ('f', 'ff'), ('g', 'gg'),
-        ('l', 'll'), ('m', 'mm'), ('n', 'nn'), ('p', 'pp'), ('r', 'rr'),
-        ('s', 'ss'), ('t', 'tt'), ('z', 'zz')
-    ]
-    
-    # Suffix patterns
-    suffix_patterns = [
-        ('ing', 'in'), ('ed', 't'), ('er', 'a'), ('ly', 'ley'), ('ful', 'full'),
-        ('able', 'ible'), ('ible', 'able'), ('tion', 'shun'), ('sion', 'shun'),
-        ('ture', 'cher'), ('sure', 'sher'), ('ous', 'us'), ('ious', 'us'),
-        ('al', 'el'), ('el', 'al'), ('le', 'el'), ('el', 'le')
-    ]
-    
-    # Prefix patterns
-    prefix_patterns = [
-        ('un', 'in'), ('in', 'un'), ('dis', 'mis'), ('mis', 'dis'),
-        ('re', 'ri'), ('pre', 'pri'), ('pro', 'pra'), ('con', 'com'),
-        ('com', 'con'), ('en', 'in'), ('em', 'im')
-    ]
-    
-    # Letter transpositions (common typing errors)
-    transposition_patterns = [
-        ('th', 'ht'), ('er', 're'), ('te', 'et'), ('on', 'no'), ('an', 'na'),
-        ('st', 'ts'), ('ar', 'ra'), ('le', 'el'), ('se', 'es'), ('ne', 'en'),
-        ('at', 'ta'), ('it', 'ti'), ('is', 'si'), ('or', 'ro'), ('al', 'la'),
-        ('de', 'ed'), ('re', 'er'), ('we', 'ew'), ('me', 'em'), ('he', 'eh'),
-        ('as', 'sa'), ('in', 'ni'), ('to', 'ot'), ('of', 'fo'), ('be', 'eb')
-    ]
-    
-    # Letter additions/removals
-    addition_patterns = [
-        ('', 'e'), ('', 'a'), ('', 'i'), ('', 'o'), ('', 'u'), ('', 'y'),
-        ('e', ''), ('a', ''), ('i', ''), ('o', ''), ('u', ''), ('y', '')
-    ]
-    
-    # Combine all patterns with their types
-    all_patterns.extend([('phonetic', old, new) for old, new in phonetic_patterns])
-    all_patterns.extend([('vowel', old, new) for old, new in vowel_patterns])
-    all_patterns.extend([('silent', old, new) for old, new in silent_patterns])
-    all_patterns.extend([('double', old, new) for old, new in double_patterns])
-    all_patterns.extend([('suffix', old, new) for old, new in suffix_patterns])
-    all_patterns.extend([('prefix', old, new) for old, new in prefix_patterns])
-    all_patterns.extend([('transpose', old, new) for old, new in transposition_patterns])
-    all_patterns.extend([('addition', old, new) for old, new in addition_patterns])
-    
-    # Shuffle all patterns for randomization
-    random.shuffle(all_patterns)
-    
-    # Try patterns randomly until we get 2 good misspellings
-    patterns_used = set()
-    
-    for pattern_type, old, new in all_patterns:
-        if len(misspellings) >= 2:
-            break
-            
-        # Skip if we've already used this pattern type
-        if pattern_type in patterns_used:
-            continue
-            
-        misspelling = None
-        
-        # Apply pattern based on type
-        if pattern_type == 'phonetic':
-            if old in word:
-                misspelling = word.replace(old, new, 1)
-        elif pattern_type == 'vowel':
-            if old in word:
-                misspelling = word.replace(old, new, 1)
-        elif pattern_type == 'silent':
+
+    def __init__(self, patterns=ALL_PATTERNS, common_misspellings=COMMON_MISSPELLINGS,
+                 lexicon=None):
+        self.patterns = tuple(patterns)
+        self.common_misspellings = common_misspellings
+        self.lexicon = lexicon
+        self._contains = {}
+        self._suffixes = {}
+        self._prefixes = {}
+        self._always = set()
+
+        for rule_id, (pattern_type, old, new) in enumerate(self.patterns):
+            if pattern_type == 'suffix':
+                self._suffixes.setdefault(old, []).append(rule_id)
+            elif pattern_type == 'prefix':
+                self._prefixes.setdefault(old, []).append(rule_id)
+            elif old:
+                self._contains.setdefault(old, []).append(rule_id)
+            else:
+                # Letter insertions apply anywhere
+                self._always.add(rule_id)
+
+        self._max_contains = max(map(len, self._contains), default=0)
+        self._max_affix = max(map(len, list(self._suffixes) + list(self._prefixes)), default=0)
+
+    def applicable(self, word):
+        """
+        Return the ids of every rule that can change this word, from one scan
+        """
+        found = set(self._always) if len(word) > 2 else set()
+        contains = self._contains
+        length = len(word)
+        for i in range(length):
+            for size in range(1, min(self._max_contains, length - i) + 1):
+                rule_ids = contains.get(word[i:i + size])
+                if rule_ids:
+                    found.update(rule_ids)
+        for size in range(1, min(self._max_affix, length) + 1):
+            found.update(self._suffixes.get(word[-size:], ()))
+            found.update(self._prefixes.get(word[:size], ()))
+        return found
+
+    def is_real_word(self, candidate):
+        return self.lexicon is not None and self.lexicon.contains(candidate)
+
+    def apply(self, word, rule_id, rng=random):
+        """
+        Apply one rule to a word (None when it does not apply)
+        """
+        pattern_type, old, new = self.patterns[rule_id]
+        if pattern_type in ('phonetic', 'vowel', 'silent', 'transpose'):
             if old in word:
-                misspelling = word.replace(old, new, 1)
+                return word.replace(old, new, 1)
         elif pattern_type == 'double':
             if old in word and old + old not in word:
-                misspelling = word.replace(old, old + old, 1)
+                return word.replace(old, old + old, 1)
             elif old + old in word:
-                misspelling = word.replace(old + old, old, 1)
+                return word.replace(old + old, old, 1)
         elif pattern_type == 'suffix':
             if word.endswith(old):
-                misspelling = word[:-len(old)] + new
+                return word[:-len(old)] + new
         elif pattern_type == 'prefix':
             if word.startswith(old):
-                misspelling = new + word[len(old):]
-        elif pattern_type == 'transpose':
-            if old in word:
-                misspelling = word.replace(old, new, 1)
+                return new + word[len(old):]
         elif pattern_type == 'addition':
             if old == '' and new != '':
                 # Add letter at random position
                 if len(word) > 2:
-                    pos = random.randint(0, len(word))
-                    misspelling = word[:pos] + new + word[pos:]
+                    pos = rng.randint(0, len(word))
+                    return word[:pos] + new + word[pos:]
             elif old != '' and new == '':
                 # Remove letter
                 if old in word:
-                    misspelling = word.replace(old, '', 1)
+                    return word.replace(old, '', 1)
+        return None
+
+    def generate(self, word, difficulty, rng=random):
+        """
+        Generate realistic misspellings with RANDOM selection of patterns
+        """
+        word = word.lower()
+        misspellings = []
         
-        # Validate misspelling
-        if (misspelling and 
-            misspelling != word and 
-            len(misspelling) >= 3 and 
-            misspelling not in misspellings):
-            
-            misspellings.append(misspelling)
-            patterns_used.add(pattern_type)
-    
-    # If we still don't have enough misspellings, try some fallback patterns
-    if len(misspellings) < 2:
-        # Simple letter changes
-        for i, char in enumerate(word):
+        # Check for exact common misspellings first
+        if word in self.common_misspellings:
+            known = self.common_misspellings[word]
+            if self.lexicon is None:
+                misspellings.extend(known)
+                return misspellings[:2]  # Return early for common words
+            # Some "common misspellings" are real words (quite/quiet, lose/loose);
+            # drop those and fill up from the patterns below
+            misspellings.extend(m for m in dict.fromkeys(known) if not self.is_real_word(m))
+            if len(misspellings) >= 2:
+                return misspellings[:2]
+        
+        # Shuffle only the rules that can change this word; sorting first
+        # keeps seeded output independent of set ordering
+        order = sorted(self.applicable(word))
+        rng.shuffle(order)
+        
+        # Try patterns randomly until we get 2 good misspellings
+        patterns_used = set()
+        
+        for rule_id in order:
             if len(misspellings) >= 2:
                 break
-            if char in 'aeiou':
-                for vowel in 'aeiou':
-                    if vowel != char:
-                        new_word = word[:i] + vowel + word[i+1:]
-                        if new_word != word and new_word not in misspellings:
-                            misspellings.append(new_word)
-                            break
-    
-    # Remove duplicates and limit to 2 misspellings
-    unique_misspellings = list(dict.fromkeys(misspellings))
-    return unique_misspellings[:2]
+            
+            # Skip if we've already used this pattern type
+            pattern_type = self.patterns[rule_id][0]
+            if pattern_type in patterns_used:
+                continue
+            
+            misspelling = self.apply(word, rule_id, rng)
+            
+            # Validate misspelling
+            if (misspelling and 
+                misspelling != word and 
+                len(misspelling) >= 3 and 
+                misspelling not in misspellings and
+                not self.is_real_word(misspelling)):
+                
+                misspellings.append(misspelling)
+                patterns_used.add(pattern_type)
+        
+        # If we still don't have enough misspellings, try some fallback patterns
+        if len(misspellings) < 2:
+            # Simple letter changes
+            for i, char in enumerate(word):
+                if len(misspellings) >= 2:
+                    break
+                if char in 'aeiou':
+                    for vowel in 'aeiou':
+                        if vowel != char:
+                            new_word = word[:i] + vowel + word[i+1:]
+                            if (new_word != word and new_word not in misspellings
+                                    and not self.is_real_word(new_word)):
+                                misspellings.append(new_word)
+                                break
+        
+        # Remove duplicates and limit to 2 misspellings
+        unique_misspellings = list(dict.fromkeys(misspellings))
+        return unique_misspellings[:2]
+
+    def _edits(self, word, rule_id):
+        # Yield (position, misspelling) for every place this rule can apply
+        pattern_type, old, new = self.patterns[rule_id]
+        if pattern_type == 'suffix':
+            if word.endswith(old):
+                yield len(word) - len(old), word[:-len(old)] + new
+        elif pattern_type == 'prefix':
+            if word.startswith(old):
+                yield 0, new + word[len(old):]
+        elif not old:
+            # Letter insertion at every position
+            if len(word) > 2:
+                for pos in range(len(word) + 1):
+                    yield pos, word[:pos] + new + word[pos:]
+        elif pattern_type == 'double':
+            doubled = old + old
+            pos = word.find(old)
+            while pos != -1:
+                if word.startswith(doubled, pos):
+                    yield pos, word[:pos] + word[pos + 1:]
+                    pos = word.find(old, pos + 2)
+                else:
+                    yield pos, word[:pos] + doubled + word[pos + 1:]
+                    pos = word.find(old, pos + 1)
+        else:
+            pos = word.find(old)
+            while pos != -1:
+                yield pos, word[:pos] + new + word[pos + len(old):]
+                pos = word.find(old, pos + 1)
+
+    def _iter_type(self, word, pattern_type, rule_ids):
+        # Candidates of one pattern type in non-increasing weight order:
+        # edits after the first letter, then edits touching it
+        weight = PATTERN_WEIGHTS[pattern_type]
+        for first_letter in (False, True):
+            for rule_id in rule_ids:
+                for pos, misspelling in self._edits(word, rule_id):
+                    if (pos == 0) == first_letter:
+                        factor = FIRST_LETTER_FACTOR if first_letter else 1.0
+                        yield weight * factor, misspelling, pattern_type
+
+    def iter_candidates(self, word):
+        """
+        Lazily yield every candidate misspelling as (misspelling, weight, pattern_type),
+        most plausible first.
+
+        Each pattern type is its own lazy stream, merged by weight, so taking
+        the top k candidates only does work proportional to k.
+        """
+        word = word.lower()
+        seen = {word}
+
+        for misspelling in self.common_misspellings.get(word, ()):
+            if misspelling not in seen and not self.is_real_word(misspelling):
+                seen.add(misspelling)
+                yield misspelling, PATTERN_WEIGHTS['common'], 'common'
+
+        by_type = {}
+        for rule_id in sorted(self.applicable(word)):
+            by_type.setdefault(self.patterns[rule_id][0], []).append(rule_id)
+
+        streams = [self._iter_type(word, pattern_type, rule_ids)
+                   for pattern_type, rule_ids in by_type.items()]
+        for weight, misspelling, pattern_type in heapq.merge(*streams, key=lambda c: -c[0]):
+            if misspelling in seen or len(misspelling) < 3 or self.is_real_word(misspelling):
+                continue
+            seen.add(misspelling)
+            yield misspelling, weight, pattern_type
+
+    def top_candidates(self, word, k):
+        """
+        Return the k most plausible misspellings of a word
+        """
+        return [misspelling for misspelling, _, _ in itertools.islice(self.iter_candidates(word), k)]
+
+    def generate_many(self, words, seed=None):
+        """
+        Yield (word, misspellings) for an iterable of (word, difficulty) pairs,
+        each drawn from its own per-word RNG stream
+        """
+        for word, difficulty in words:
+            rng = word_rng(seed, 'misspellings', word.lower())
+            yield word, self.generate(word, difficulty, rng)
+
+DEFAULT_ENGINE = MisspellingEngine()
 
-def improve_misspellings():
+def generate_realistic_misspellings(word, difficulty, rng=random):
+    """
+    Generate realistic misspellings with RANDOM selection of patterns
+
+    Pass a seeded rng (see pipeline_seed.word_rng) to get the same
+    misspellings for a word on every run.
+    """
+    return DEFAULT_ENGINE.generate(word, difficulty, rng)
+
+# Engine used by _generate_chunk; worker processes get theirs from _init_worker
+_worker_engine = DEFAULT_ENGINE
+
+def _init_worker(engine):
+    # Runs once per worker process, so the lexicon is only shipped over once
+    global _worker_engine
+    _worker_engine = engine
+
+def _generate_chunk(items, seed, top_k):
+    """
+    Worker entry point: misspellings for a chunk of (word, difficulty) pairs
+    """
+    if top_k:
+        return [_worker_engine.top_candidates(word, top_k) for word, _ in items]
+    return [misspellings for _, misspellings in _worker_engine.generate_many(items, seed)]
+
+def regenerate_misspellings(items, seed, top_k=None, workers=1, engine=DEFAULT_ENGINE):
+    """
+    Generate misspellings for (word, difficulty) pairs, in order.
+
+    Every word uses its own seeded RNG stream, so the result does not depend
+    on how the words are split between worker processes.
+    """
+    if workers <= 1 or len(items) < 2:
+        _init_worker(engine)
+        return _generate_chunk(items, seed, top_k)
+
+    chunk_size = max(1, math.ceil(len(items) / (workers * 4)))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(engine,)) as executor:
+        for chunk_result in executor.map(_generate_chunk, chunks,
+                                         itertools.repeat(seed), itertools.repeat(top_k)):
+            results.extend(chunk_result)
+    return results
+
+def lexicon_fingerprint(path):
+    """
+    Identify a lexicon file by name, size and modification time
+    """
+    if not path:
+        return None
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+def word_content_hash(word_data, seed, top_k, lexicon=None):
+    """
+    Hash of everything that decides a word's generated misspellings, plus
+    the misspellings it currently has.
+
+    Including the output means a word is regenerated when another script
+    rewrites its misspellings, not only when its inputs change.
+    """
+    key = json.dumps([
+        word_data.get('correctSpelling', '').lower(),
+        word_data.get('difficulty', 1),
+        seed,
+        top_k,
+        lexicon,
+        word_data.get('misspellings', []),
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('words', {})
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(path, hashes):
+    manifest = {"version": 2, "words": hashes}
+    atomic_write(path, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+def improve_misspellings(seed=None, top_k=None, workers=1, full=False, manifest_path=MANIFEST_FILE,
+                         lexicon_path=None, writer=DEFAULT_WRITER):
     """
     Improve misspellings in the words_combined.json file
+
+    With top_k, each word gets its top_k most plausible weighted candidates
+    instead of two randomly picked patterns. Unless full is set, only words
+    whose correctSpelling, difficulty or misspellings changed since the last
+    run (per the content-hash manifest) are regenerated. With lexicon_path, candidates
+    that are real words in that dictionary are never used.
     """
     print("Improving misspellings in words_combined.json...")
     
+    engine = DEFAULT_ENGINE
+    fingerprint = None
+    if lexicon_path:
+        try:
+            lexicon = load_backend(lexicon_path)
+            fingerprint = lexicon_fingerprint(lexicon_path)
+        except OSError as e:
+            print(f"❌ Error loading lexicon {lexicon_path}: {e}")
+            return
+        engine = MisspellingEngine(lexicon=lexicon)
+        print(f"✅ Loaded {len(lexicon)} real words from {lexicon_path}")
+    
     # Load the current words
     try:
         with open('assets/data/words_combined.json', 'r') as f:
@@ -337,44 +624,71 @@ def improve_misspellings():
         print(f"❌ Error loading words: {e}")
         return
     
+    # Find the words that actually need new misspellings
+    manifest = {} if full else load_manifest(manifest_path)
+    hashes = {}
+    pending = []
+    for i, word_data in enumerate(words):
+        correct_spelling = word_data.get('correctSpelling', '')
+        if not correct_spelling:
+            continue
+        content_hash = word_content_hash(word_data, seed, top_k, fingerprint)
+        hashes[correct_spelling.lower()] = content_hash
+        if manifest.get(correct_spelling.lower()) != content_hash:
+            pending.append(i)
+    
+    print(f"📋 {len(pending)} of {len(words)} words need new misspellings")
+    if not pending:
+        print("✅ All misspellings are up to date, nothing to write")
+        return
+    
     # Create backup
     try:
-        with open('assets/data/words_combined_backup2.json', 'w') as f:
-            json.dump(data, f, indent=2)
+        writer.write_json('assets/data/words_combined_backup2.json', data, compress=())
         print("✅ Created backup: words_combined_backup2.json")
     except Exception as e:
         print(f"⚠️ Warning: Could not create backup: {e}")
     
+    # Unseeded runs still draw each word from its own stream, keyed by a
+    # random run seed, so worker processes don't repeat each other's choices
+    run_seed = seed if seed is not None else int.from_bytes(os.urandom(8), 'big')
+    items = [(words[i]['correctSpelling'], words[i].get('difficulty', 1)) for i in pending]
+    if workers > 1:
+        print(f"Generating with {workers} worker processes...")
+    generated = regenerate_misspellings(items, run_seed, top_k, workers, engine)
+    
     # Improve misspellings for each word
     improved_count = 0
-    for i, word_data in enumerate(words):
+    for done, (i, new_misspellings) in enumerate(zip(pending, generated), 1):
+        word_data = words[i]
         original_misspellings = word_data.get('misspellings', [])
-        correct_spelling = word_data.get('correctSpelling', '')
-        difficulty = word_data.get('difficulty', 1)
+        correct_spelling = word_data['correctSpelling']
+        word_data['misspellings'] = new_misspellings
+        hashes[correct_spelling.lower()] = word_content_hash(word_data, seed, top_k, fingerprint)
         
-        if correct_spelling:
-            new_misspellings = generate_realistic_misspellings(correct_spelling, difficulty)
-            word_data['misspellings'] = new_misspellings
-            
-            if new_misspellings != original_misspellings:
-                improved_count += 1
-                if improved_count <= 10:  # Show first 10 improvements
-                    print(f"Improved '{correct_spelling}': {original_misspellings} → {new_misspellings}")
+        if new_misspellings != original_misspellings:
+            improved_count += 1
+            if improved_count <= 10:  # Show first 10 improvements
+                print(f"Improved '{correct_spelling}': {original_misspellings} → {new_misspellings}")
         
         # Progress indicator
-        if (i + 1) % 100 == 0:
-            print(f"Processed {i + 1}/{len(words)} words...")
+        if done % 100 == 0:
+            print(f"Processed {done}/{len(pending)} words...")
     
     # Save improved words
     try:
-        with open('assets/data/words_combined.json', 'w') as f:
-            json.dump(data, f, indent=2)
+        writer.write_json('assets/data/words_combined.json', data)
         print(f"✅ Saved improved words to words_combined.json")
         print(f"🎉 Improved misspellings for {improved_count} words!")
     except Exception as e:
         print(f"❌ Error saving words: {e}")
         return
     
+    try:
+        save_manifest(manifest_path, hashes)
+    except OSError as e:
+        print(f"⚠️ Warning: Could not save manifest {manifest_path}: {e}")
+    
     # Show some examples
     print("\n📝 Example improvements:")
     for i, word_data in enumerate(words[:10]):
@@ -383,8 +697,37 @@ def improve_misspellings():
         print(f"  {correct}: {misspellings}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Regenerate realistic misspellings in words_combined.json")
+    add_seed_argument(parser)
+    parser.add_argument('--top-k', type=int, default=None,
+                        help="Use the K most plausible weighted candidates instead of 2 random patterns")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of processes used to generate misspellings")
+    parser.add_argument('--full', action='store_true',
+                        help="Regenerate every word, ignoring the manifest of unchanged words")
+    parser.add_argument('--manifest', default=MANIFEST_FILE,
+                        help="Content-hash manifest used for incremental regeneration")
+    parser.add_argument('--lexicon', default=LEXICON_FILE,
+                        help="Word list or Hunspell .dic of real words that must not be used as misspellings")
+    parser.add_argument('--no-lexicon', action='store_true',
+                        help="Skip the real-word check")
+    parser.add_argument('--yes', '-y', action='store_true',
+                        help="Don't ask for confirmation")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    seed = resolve_seed(args.seed)
+    
+    lexicon_path = None
+    if not args.no_lexicon:
+        if os.path.exists(args.lexicon):
+            lexicon_path = args.lexicon
+        else:
+            print(f"⚠️ Warning: lexicon {args.lexicon} not found, skipping the real-word check")
+    
     print("Better Misspelling Improvement Script")
     print("This script generates REALISTIC misspellings people actually make")
+    if seed is not None:
+        print(f"Using seed {seed} for reproducible output")
     print()
     
     # Confirm before proceeding
@@ -394,13 +737,16 @@ def main():
     print("- Replace the current misspellings with better ones")
     print()
     
-    response = input("Continue? (y/n): ").lower().strip()
-    if response != 'y':
-        print("Cancelled.")
-        return
+    # Only ask when a person is at the terminal, so the script can run in a build pipeline
+    if not args.yes and sys.stdin.isatty():
+        response = input("Continue? (y/n): ").lower().strip()
+        if response != 'y':
+            print("Cancelled.")
+            return
     
     # Improve misspellings
-    improve_misspellings()
+    improve_misspellings(seed, args.top_k, args.workers, args.full, args.manifest, lexicon_path,
+                         writer_from_args(args))
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Offline word-validation backends.
+
+A backend answers "is this a real word?" from files on disk, so the
+validator only needs the dictionary API for misses and missing definitions
+(or not at all in an air-gapped build). Two formats are supported:
+
+- word lists: words_dictionary.json, one-word-per-line text, or gzip of either
+- Hunspell-style dictionaries: a .dic word list plus its .aff affix rules
+"""
+
+import os
+import re
+
+from parse_dictionary_better import iter_dictionary_words
+
+class WordListBackend:
+    """
+    Membership checks against a plain word list held in a frozenset
+    """
+
+    def __init__(self, words):
+        self.words = frozenset(word.strip().lower() for word in words if word.strip())
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(iter_dictionary_words(path))
+
+    def __len__(self):
+        return len(self.words)
+
+    def contains(self, word):
+        return word.lower() in self.words
+
+class _AffixRule:
+    __slots__ = ('flag', 'strip', 'add', 'condition', 'cross_product')
+
+    def __init__(self, flag, strip, add, condition, cross_product):
+        self.flag = flag
+        self.strip = strip
+        self.add = add
+        self.condition = condition
+        self.cross_product = cross_product
+
+class HunspellBackend:
+    """
+    Membership checks against a Hunspell .dic/.aff pair.
+
+    Instead of expanding every stem into all of its forms, a word is checked
+    by undoing each prefix/suffix rule that could have produced it and
+    looking the resulting stem up, which keeps memory at one entry per stem.
+    """
+
+    def __init__(self, stems, prefixes=None, suffixes=None):
+        self.stems = stems
+        # Rules are indexed by the text they add so only plausible ones are tried
+        self.prefixes = self._index(prefixes or [])
+        self.suffixes = self._index(suffixes or [])
+
+    @staticmethod
+    def _index(rules):
+        index = {}
+        for rule in rules:
+            index.setdefault(rule.add, []).append(rule)
+        return index
+
+    @classmethod
+    def from_files(cls, dic_path, aff_path=None):
+        if aff_path is None:
+            aff_path = os.path.splitext(dic_path)[0] + '.aff'
+        encoding = 'iso8859-1'
+        flag_mode = 'short'
+        prefixes = []
+        suffixes = []
+
+        if os.path.exists(aff_path):
+            encoding, flag_mode, prefixes, suffixes = cls._parse_aff(aff_path)
+
+        stems = {}
+        with open(dic_path, 'r', encoding=encoding, errors='replace') as f:
+            for line_num, line in enumerate(f):
+                line = line.strip()
+                # The first line is the approximate entry count
+                if not line or (line_num == 0 and line.isdigit()):
+                    continue
+                entry = line.split()[0]
+                word, _, flags = entry.partition('/')
+                word = word.lower()
+                stems[word] = stems.get(word, frozenset()) | frozenset(cls._split_flags(flags, flag_mode))
+
+        return cls(stems, prefixes, suffixes)
+
+    @staticmethod
+    def _split_flags(flags, flag_mode):
+        if not flags:
+            return []
+        if flag_mode == 'long':
+            return [flags[i:i + 2] for i in range(0, len(flags), 2)]
+        if flag_mode == 'num':
+            return flags.split(',')
+        return list(flags)
+
+    @classmethod
+    def _parse_aff(cls, aff_path):
+        # SET may appear anywhere, so read the encoding first
+        encoding = 'iso8859-1'
+        with open(aff_path, 'r', encoding='iso8859-1') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == 'SET':
+                    encoding = parts[1].lower()
+                    break
+
+        flag_mode = 'short'
+        cross_products = {}
+        prefixes = []
+        suffixes = []
+        with open(aff_path, 'r', encoding=encoding, errors='replace') as f:
+            for line in f:
+                parts = line.split()
+                if not parts or parts[0].startswith('#'):
+                    continue
+                if parts[0] == 'FLAG' and len(parts) >= 2:
+                    flag_mode = parts[1]
+                elif parts[0] in ('PFX', 'SFX') and len(parts) >= 4:
+                    kind, flag = parts[0], parts[1]
+                    if (kind, flag) not in cross_products:
+                        # Header line: PFX/SFX flag cross_product count
+                        cross_products[(kind, flag)] = parts[2] == 'Y'
+                        continue
+                    strip = '' if parts[2] == '0' else parts[2].lower()
+                    add = parts[3].split('/')[0]
+                    add = '' if add == '0' else add.lower()
+                    condition = parts[4] if len(parts) >= 5 else '.'
+                    if kind == 'SFX':
+                        pattern = re.compile('(?:' + condition + ')$')
+                        suffixes.append(_AffixRule(flag, strip, add, pattern,
+                                                   cross_products[(kind, flag)]))
+                    else:
+                        pattern = re.compile('^(?:' + condition + ')')
+                        prefixes.append(_AffixRule(flag, strip, add, pattern,
+                                                   cross_products[(kind, flag)]))
+        return encoding, flag_mode, prefixes, suffixes
+
+    def __len__(self):
+        return len(self.stems)
+
+    def _stem_has(self, stem, flag):
+        flags = self.stems.get(stem)
+        return flags is not None and flag in flags
+
+    def _suffix_stems(self, word):
+        # Yield (stem, rule) for every suffix rule that could have produced word
+        for length in range(0, len(word)):
+            ending = word[len(word) - length:] if length else ''
+            for rule in self.suffixes.get(ending, ()):
+                stem = word[:len(word) - length] + rule.strip
+                if stem and rule.condition.search(stem):
+                    yield stem, rule
+
+    def contains(self, word):
+        word = word.lower()
+        if word in self.stems:
+            return True
+
+        for stem, rule in self._suffix_stems(word):
+            if self._stem_has(stem, rule.flag):
+                return True
+
+        for length in range(0, len(word)):
+            start = word[:length]
+            for rule in self.prefixes.get(start, ()):
+                rest = rule.strip + word[length:]
+                if not rest or not rule.condition.search(rest):
+                    continue
+                if self._stem_has(rest, rule.flag):
+                    return True
+                # Prefix and suffix together, when both rules allow it
+                if rule.cross_product:
+                    for stem, suffix in self._suffix_stems(rest):
+                        if (suffix.cross_product and self._stem_has(stem, rule.flag)
+                                and self._stem_has(stem, suffix.flag)):
+                            return True
+        return False
+
+def load_backend(path):
+    """
+    Load a backend for a word list or a Hunspell .dic (with a sibling .aff)
+    """
+    if path.endswith('.dic'):
+        return HunspellBackend.from_files(path)
+    return WordListBackend.from_file(path)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Persistent SQLite cache of dictionary API lookups.
+
+Entries are keyed by lowercase word and store the validity verdict, the
+definition and when it was fetched. Found words and 404s expire separately,
+so a word the API did not know yet is re-checked sooner than a known one.
+API errors are never cached.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_FILE = '.cache/dictionary_lookups.sqlite3'
+
+# Found words rarely disappear; 404s are re-checked more often
+DEFAULT_TTL_DAYS = 180
+DEFAULT_NOT_FOUND_TTL_DAYS = 30
+
+DAY = 24 * 60 * 60
+
+class LookupCache:
+    """
+    Thread-safe on-disk cache of (valid, definition) lookups
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, ttl_days=DEFAULT_TTL_DAYS,
+                 not_found_ttl_days=DEFAULT_NOT_FOUND_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * DAY
+        self.not_found_ttl = not_found_ttl_days * DAY
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            " word TEXT PRIMARY KEY,"
+            " valid INTEGER NOT NULL,"
+            " definition TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, word):
+        """
+        Return (valid, definition) for a fresh entry, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT valid, definition, fetched_at FROM lookups WHERE word = ?",
+                (word.lower(),)
+            ).fetchone()
+            if row is not None:
+                valid, definition, fetched_at = row
+                ttl = self.ttl if valid else self.not_found_ttl
+                if time.time() - fetched_at < ttl:
+                    self.hits += 1
+                    return bool(valid), definition
+            self.misses += 1
+            return None
+
+    def put(self, word, valid, definition):
+        """
+        Store a verdict; API errors (valid is None) are ignored
+        """
+        if valid is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookups (word, valid, definition, fetched_at) VALUES (?, ?, ?, ?)",
+                (word.lower(), int(bool(valid)), definition or "", time.time())
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        """
+        Delete expired entries and return how many were removed
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM lookups WHERE (valid = 1 AND fetched_at < ?) OR (valid = 0 AND fetched_at < ?)",
+                (now - self.ttl, now - self.not_found_ttl)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,7 +1,28 @@
+import argparse
+import functools
+import gzip
+import heapq
+import itertools
 import json
 import re
 import os
 import random  # Added for random selection
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from asset_writer import add_output_arguments, writer_from_args
+from pipeline_seed import add_seed_argument, derive_seed, resolve_seed
+
+DICTIONARY_FILE = 'assets/data/words_dictionary.json'
+
+# How many characters the streaming JSON reader pulls from disk at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# How many dictionary words each worker filters per task in --workers mode
+SHARD_SIZE = 20000
+
+# Target counts for each level (increased to 500 each)
+TARGETS = {1: 500, 2: 500, 3: 500, 4: 500, 5: 500}
 
 def create_builtin_word_list():
     """
@@ -26,39 +47,59 @@ def create_builtin_word_list():
     
     return common_words
 
+# Built once at import time instead of on every is_real_word_better() call
+COMMON_WORDS = frozenset(create_builtin_word_list())
+
+# Common problematic words that are never used in the game
+SKIP_WORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'can', 'must', 'shall'
+})
+
+# More aggressive nonsense patterns, compiled once
+NONSENSE_PATTERNS = [re.compile(pattern) for pattern in (
+    r'^[aeiou]{2,}$',  # All vowels (aa, aaa, etc.)
+    r'^[bcdfghjklmnpqrstvwxyz]{4,}$',  # All consonants
+    r'^([a-z])\1{2,}$',  # Repeated letters (aaa, bbb, etc.)
+    r'^[a-z]{1,4}$',  # Too short (now 5+ letters minimum)
+    r'^[a-z]{16,}$',  # Too long
+    r'^[aeiou][bcdfghjklmnpqrstvwxyz][aeiou]$',  # Vowel-consonant-vowel patterns that are often nonsense
+    r'^[bcdfghjklmnpqrstvwxyz][aeiou][bcdfghjklmnpqrstvwxyz]$',  # Consonant-vowel-consonant patterns that are often nonsense
+    r'^[aeiou]{3,}[bcdfghjklmnpqrstvwxyz]*$',  # Too many vowels at start
+    r'^[bcdfghjklmnpqrstvwxyz]*[aeiou]{3,}$',  # Too many vowels at end
+)]
+
+# Common word patterns every word must contain
+COMMON_PATTERNS = [re.compile(pattern) for pattern in (
+    r'^[a-z]{5,15}$',  # Reasonable length (5+ letters minimum)
+    r'[aeiouy]',  # Contains at least one vowel
+    r'[bcdfghjklmnpqrstvwxyz]',  # Contains at least one consonant
+)]
+
+VOWEL_RE = re.compile(r'[aeiou]')
+CONSONANT_RE = re.compile(r'[bcdfghjklmnpqrstvwxyz]')
+FIVE_LETTER_RE = re.compile(r'^[bcdfghjklmnpqrstvwxyz][aeiou][bcdfghjklmnpqrstvwxyz][aeiou][bcdfghjklmnpqrstvwxyz]$')
+LETTERS_RE = re.compile(r'^[a-z]+$')
+
 def is_real_word_better(word):
     """
     Better validation that catches more nonsense words
     """
     word = word.lower().strip()
     
-    # Get common words for validation
-    common_words = create_builtin_word_list()
-    
     # Check against common words first (fast)
-    if word in common_words:
+    if word in COMMON_WORDS:
         return True
     
-    # More aggressive nonsense patterns
-    nonsense_patterns = [
-        r'^[aeiou]{2,}$',  # All vowels (aa, aaa, etc.)
-        r'^[bcdfghjklmnpqrstvwxyz]{4,}$',  # All consonants
-        r'^([a-z])\1{2,}$',  # Repeated letters (aaa, bbb, etc.)
-        r'^[a-z]{1,4}$',  # Too short (now 5+ letters minimum)
-        r'^[a-z]{16,}$',  # Too long
-        r'^[aeiou][bcdfghjklmnpqrstvwxyz][aeiou]$',  # Vowel-consonant-vowel patterns that are often nonsense
-        r'^[bcdfghjklmnpqrstvwxyz][aeiou][bcdfghjklmnpqrstvwxyz]$',  # Consonant-vowel-consonant patterns that are often nonsense
-        r'^[aeiou]{3,}[bcdfghjklmnpqrstvwxyz]*$',  # Too many vowels at start
-        r'^[bcdfghjklmnpqrstvwxyz]*[aeiou]{3,}$',  # Too many vowels at end
-    ]
-    
-    for pattern in nonsense_patterns:
-        if re.match(pattern, word):
+    for pattern in NONSENSE_PATTERNS:
+        if pattern.match(word):
             return False
     
     # Check for reasonable vowel-consonant ratio
-    vowels = len(re.findall(r'[aeiou]', word))
-    consonants = len(re.findall(r'[bcdfghjklmnpqrstvwxyz]', word))
+    vowels = len(VOWEL_RE.findall(word))
+    consonants = len(CONSONANT_RE.findall(word))
     
     # Words should have a reasonable vowel-consonant ratio
     if consonants > 0 and vowels > 0:
@@ -66,55 +107,107 @@ def is_real_word_better(word):
         if ratio < 0.2 or ratio > 3.0:  # Too few or too many vowels
             return False
     
-    # Check for common word patterns
-    common_patterns = [
-        r'^[a-z]{5,15}$',  # Reasonable length (5+ letters minimum)
-        r'[aeiouy]',  # Contains at least one vowel
-        r'[bcdfghjklmnpqrstvwxyz]',  # Contains at least one consonant
-    ]
-    
-    for pattern in common_patterns:
-        if not re.search(pattern, word):
+    for pattern in COMMON_PATTERNS:
+        if not pattern.search(word):
             return False
     
     # Additional checks for 5-letter words (minimum length now)
     if len(word) == 5:
         # Check if it follows common English patterns
-        if not re.match(r'^[bcdfghjklmnpqrstvwxyz][aeiou][bcdfghjklmnpqrstvwxyz][aeiou][bcdfghjklmnpqrstvwxyz]$', word):
+        if not FIVE_LETTER_RE.match(word):
             return False
     
     return True
 
+# Maps every letter to 'v' (vowel) or 'c' (consonant, 'y' included) so a
+# word's shape can be checked with plain string operations
+SHAPE_TABLE = str.maketrans(
+    'abcdefghijklmnopqrstuvwxyz',
+    'vcccvcccvcccccvcccccvccccc'
+)
+
+class WordFilter:
+    """
+    Precompiled filter engine that gives the same results as is_good_word,
+    but classifies each word with a single shape scan instead of a dozen
+    separate regex passes
+    """
+
+    def __init__(self, common_words=COMMON_WORDS, skip_words=SKIP_WORDS,
+                 min_length=5, max_length=15):
+        self.common_words = frozenset(common_words)
+        self.skip_words = frozenset(skip_words)
+        self.min_length = min_length
+        self.max_length = max_length
+
+    def classify(self, word):
+        """
+        Return (accepted, vowels, consonants) for a word.
+
+        Counts are None when the word is rejected before its shape is scanned
+        (wrong length, non-letters, skip word) or accepted straight from the
+        common word list.
+        """
+        word = word.lower().strip()
+        length = len(word)
+
+        # Must be 5-15 characters, letters only, and not a problematic word
+        if length < self.min_length or length > self.max_length:
+            return False, None, None
+        if not (word.isascii() and word.isalpha()) or word in self.skip_words:
+            return False, None, None
+        if word in self.common_words:
+            return True, None, None
+
+        shape = word.translate(SHAPE_TABLE)
+        vowels = shape.count('v')
+        consonants = length - vowels
+
+        # All vowels, all consonants, or a single repeated letter
+        if vowels == 0 or consonants == 0:
+            return False, vowels, consonants
+
+        # Too many vowels at the start or the end with only consonants around them
+        leading = length - len(shape.lstrip('v'))
+        if leading >= 3 and leading == vowels:
+            return False, vowels, consonants
+        trailing = length - len(shape.rstrip('v'))
+        if trailing >= 3 and trailing == vowels:
+            return False, vowels, consonants
+
+        # Too few or too many vowels
+        ratio = vowels / consonants
+        if ratio < 0.2 or ratio > 3.0:
+            return False, vowels, consonants
+
+        # 5-letter words must follow consonant-vowel-consonant-vowel-consonant
+        if length == 5 and shape != 'cvcvc':
+            return False, vowels, consonants
+
+        return True, vowels, consonants
+
+    def accepts(self, word):
+        """
+        Check if a word is suitable for the game
+        """
+        return self.classify(word)[0]
+
+    def filter_words(self, words):
+        """
+        Yield (word, difficulty) for every accepted word in an iterable
+        """
+        classify = self.classify
+        for word in words:
+            if classify(word)[0]:
+                yield word.lower(), get_difficulty(word)
+
+DEFAULT_FILTER = WordFilter()
+
 def is_good_word(word):
     """
     Check if a word is suitable for the game
     """
-    word = word.lower().strip()
-    
-    # Must be 5-15 characters (removed words under 5 letters)
-    if len(word) < 5 or len(word) > 15:
-        return False
-    
-    # Only letters, no numbers, hyphens, apostrophes
-    if not re.match(r'^[a-z]+$', word):
-        return False
-    
-    # Skip common problematic words
-    skip_words = {
-        'a', 'an', 'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-        'should', 'may', 'might', 'can', 'must', 'shall'
-    }
-    
-    if word in skip_words:
-        return False
-    
-    # Check if it's a real word
-    if not is_real_word_better(word):
-        return False
-    
-    return True
+    return DEFAULT_FILTER.accepts(word)
 
 def get_difficulty(word):
     """
@@ -174,68 +267,317 @@ def create_simple_misspellings(word):
                 break
         break
     
-    return list(set(misspellings))[:3]
+    # dict.fromkeys keeps first-seen order, unlike set() whose order changes
+    # with PYTHONHASHSEED and would make builds differ between runs
+    return list(dict.fromkeys(misspellings))[:3]
+
+def open_dictionary(path):
+    """
+    Open a dictionary file for reading as text, transparently handling gzip
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+    if magic == b'\x1f\x8b':
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+def iter_json_keys(f, chunk_size=READ_CHUNK_SIZE):
+    """
+    Yield the keys of a top-level JSON object as they are parsed.
+
+    Only a small window of the file is held in memory, so peak memory stays
+    flat no matter how big words_dictionary.json gets.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def next_char():
+        # Skip whitespace and return the next significant character (or '')
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buf) or eof:
+                return buf[pos] if pos < len(buf) else ''
+            fill()
+
+    def decode_value():
+        # raw_decode can succeed on a truncated number ("1.5e" -> 1.5), so
+        # only trust a value followed by a delimiter or the end of the file
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                if eof or (end < len(buf) and buf[end] in ' \t\r\n,:}]'):
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    if next_char() != '{':
+        raise ValueError("Expected a JSON object of words")
+    pos += 1
+    if next_char() == '}':
+        return
+
+    while True:
+        if next_char() != '"':
+            raise ValueError(f"Expected a word key, got {next_char()!r}")
+        key = decode_value()
+        if next_char() != ':':
+            raise ValueError(f"Expected ':' after {key!r}")
+        pos += 1
+        next_char()
+        decode_value()
+        yield key
+
+        separator = next_char()
+        pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise ValueError(f"Expected ',' or '}}' after {key!r}")
+
+class _Prefixed:
+    """
+    File wrapper that replays already-consumed characters before reading on
+    """
+
+    def __init__(self, prefix, f):
+        self.prefix = prefix
+        self.f = f
+
+    def read(self, size):
+        if self.prefix:
+            data, self.prefix = self.prefix, ''
+            return data + self.f.read(size)
+        return self.f.read(size)
+
+def iter_dictionary_words(path):
+    """
+    Stream candidate words from a dictionary file.
+
+    Supports a JSON object keyed by word (words_dictionary.json), plain text
+    with one word per line, and gzip-compressed versions of either.
+    """
+    with open_dictionary(path) as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        if first == '{':
+            # Hand the brace back to the JSON reader
+            yield from iter_json_keys(_Prefixed(first, f))
+            return
+        pending = first
+        for line in f:
+            word = (pending + line).strip()
+            pending = ''
+            if word:
+                yield word
+        if pending.strip():
+            yield pending.strip()
+
+def iter_shards(words, shard_size=SHARD_SIZE):
+    """
+    Split a stream of words into lists of at most shard_size words
+    """
+    words = iter(words)
+    while True:
+        shard = list(itertools.islice(words, shard_size))
+        if not shard:
+            return
+        yield shard
+
+class LevelReservoir:
+    """
+    Streaming per-level sample that keeps at most targets[level] words.
+
+    Every word gets a pseudo-random priority from a hash of the salt and the
+    word, and each level keeps the words with the smallest priorities. That
+    is a uniform sample that needs O(target) memory, and because it does not
+    depend on the order words arrive in, reservoirs filled from different
+    shards can be merged and still give the same result.
+    """
+
+    def __init__(self, targets, salt):
+        self.targets = dict(targets)
+        self.salt = salt
+        self.available = {level: 0 for level in self.targets}
+        self._heaps = {level: [] for level in self.targets}
+
+    def priority(self, word):
+        return derive_seed(self.salt, 'select', word)
+
+    def add(self, word, difficulty):
+        self.available[difficulty] += 1
+        self._push(difficulty, self.priority(word), word)
+
+    def _push(self, level, priority, word):
+        # Max-heap on priority via negation, so the root is the entry to
+        # evict when a better one arrives. Ties fall back to comparing words,
+        # which keeps the result independent of arrival order.
+        heap = self._heaps[level]
+        entry = (-priority, word)
+        if len(heap) < self.targets[level]:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def merge(self, other):
+        """
+        Fold another reservoir (built with the same salt) into this one
+        """
+        for level, heap in other._heaps.items():
+            self.available[level] += other.available[level]
+            for negated, word in heap:
+                self._push(level, -negated, word)
+
+    def selected(self, level):
+        """
+        Return the sampled words for a level, ordered by priority
+        """
+        return [word for _, word in sorted(self._heaps[level], reverse=True)]
+
+def sample_shard(shard, targets, salt):
+    """
+    Filter one shard straight into a per-level reservoir
+    """
+    reservoir = LevelReservoir(targets, salt)
+    for word, difficulty in DEFAULT_FILTER.filter_words(shard):
+        reservoir.add(word, difficulty)
+    return len(shard), reservoir
+
+def filter_shard(shard):
+    """
+    Return (processed, accepted words) for one shard
+    """
+    return len(shard), [word for word, _ in DEFAULT_FILTER.filter_words(shard)]
+
+def _map_shards(func, words, workers=1, shard_size=SHARD_SIZE):
+    # Only a few shards per worker are in flight at once, so the dictionary
+    # is still streamed when it is processed in a pool
+    shards = iter_shards(words, shard_size)
+    if workers <= 1:
+        yield from map(func, shards)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for shard in shards:
+            pending.append(executor.submit(func, shard))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def iter_sampled_shards(words, targets, salt, workers=1, shard_size=SHARD_SIZE):
+    """
+    Yield (processed, reservoir) for each shard of the word stream.
+
+    With workers > 1 the shards are filtered and sampled in a process pool,
+    and each worker only sends back its O(target) sample.
+    """
+    sample = functools.partial(sample_shard, targets=targets, salt=salt)
+    yield from _map_shards(sample, words, workers, shard_size)
+
+def iter_filtered_shards(words, workers=1, shard_size=SHARD_SIZE):
+    """
+    Yield (processed, accepted words) for each shard of the word stream
+    """
+    yield from _map_shards(filter_shard, words, workers, shard_size)
 
 def main():
     print("Starting better dictionary parsing with random selection...")
     
+    parser = argparse.ArgumentParser(description="Build the level word files from a dictionary")
+    parser.add_argument('--dictionary', default=DICTIONARY_FILE,
+                        help="JSON object, one-word-per-line text, or gzip of either")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of processes used to filter the dictionary")
+    parser.add_argument('--difficulty', choices=('score', 'length'), default='score',
+                        help="Level words by quantile of a feature score, or by length only")
+    add_seed_argument(parser)
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    seed = resolve_seed(args.seed)
+    writer = writer_from_args(args)
+    if seed is not None:
+        print(f"Using seed {seed} for reproducible output")
+    
     # Check if dictionary file exists
-    dict_file = 'assets/data/words_dictionary.json'
+    dict_file = args.dictionary
     if not os.path.exists(dict_file):
         print(f"Error: {dict_file} not found!")
         return
     
-    # Load dictionary
+    # Sample words by difficulty as they stream in. An unseeded run uses a
+    # random salt, so it still picks different words every time.
+    salt = str(seed) if seed is not None else os.urandom(8).hex()
+    reservoir = LevelReservoir(TARGETS, salt)
+    
+    print("Streaming, processing and validating words...")
+    processed = 0
+    
+    if args.workers > 1:
+        print(f"Filtering with {args.workers} worker processes...")
     try:
-        with open(dict_file, 'r') as f:
-            print("Loading dictionary file...")
-            word_dict = json.load(f)
-        print(f"Loaded {len(word_dict)} words")
+        words = iter_dictionary_words(dict_file)
+        if args.difficulty == 'length':
+            for shard_processed, shard_reservoir in iter_sampled_shards(words, TARGETS, salt, args.workers):
+                reservoir.merge(shard_reservoir)
+                processed += shard_processed
+                valid_words = sum(reservoir.available.values())
+                print(f"Processed {processed} words, found {valid_words} valid words...")
+        else:
+            # Quantile levels need the whole candidate set before sampling
+            candidates = {}
+            for shard_processed, accepted in iter_filtered_shards(words, args.workers):
+                candidates.update(dict.fromkeys(accepted))
+                processed += shard_processed
+                print(f"Processed {processed} words, found {len(candidates)} valid words...")
     except Exception as e:
         print(f"Error loading dictionary: {e}")
         return
     
-    # Organize words by difficulty
-    levels = {1: [], 2: [], 3: [], 4: [], 5: []}
+    if args.difficulty == 'score':
+        # Imported here: difficulty_scoring imports this module back
+        # (through improve_misspellings_better and local_lexicon)
+        from difficulty_scoring import np, score_levels
+        if np is None:
+            print("NumPy not installed, scoring in plain Python (slower)")
+        print(f"Scoring difficulty of {len(candidates)} candidates...")
+        candidates = list(candidates)
+        for word, level in zip(candidates, score_levels(candidates, workers=args.workers)):
+            reservoir.add(word, level)
     
-    print("Processing and validating words...")
-    processed = 0
-    valid_words = 0
-    
-    for word in word_dict.keys():
-        if is_good_word(word):
-            difficulty = get_difficulty(word)
-            levels[difficulty].append(word.lower())
-            valid_words += 1
-        
-        processed += 1
-        if processed % 1000 == 0:
-            print(f"Processed {processed} words, found {valid_words} valid words...")
-    
-    print(f"Total valid words found: {valid_words}")
+    print(f"Loaded {processed} words")
+    print(f"Total valid words found: {sum(reservoir.available.values())}")
     
     # Print available words per level
     for level in range(1, 6):
-        print(f"Level {level}: {len(levels[level])} words available")
+        print(f"Level {level}: {reservoir.available[level]} words available")
     
     # Create word objects for each level with RANDOM selection
     word_objects = {1: [], 2: [], 3: [], 4: [], 5: []}
     
-    # Target counts for each level (increased to 500 each)
-    targets = {1: 500, 2: 500, 3: 500, 4: 500, 5: 500}
-    
     print("Creating word objects with random selection...")
     for level in range(1, 6):
-        available_words = levels[level]
-        target_count = min(targets[level], len(available_words))
+        # Randomly selected from throughout the entire level by the reservoir
+        selected_words = reservoir.selected(level)
         
-        # Randomly select words from throughout the entire level
-        if len(available_words) > target_count:
-            selected_words = random.sample(available_words, target_count)
-        else:
-            selected_words = available_words
-        
-        print(f"Level {level}: Randomly selected {len(selected_words)} words from {len(available_words)} available")
+        print(f"Level {level}: Randomly selected {len(selected_words)} words from {reservoir.available[level]} available")
         
         for word in selected_words:
             misspellings = create_simple_misspellings(word)
@@ -254,12 +596,11 @@ def main():
     for level in range(1, 6):
         filename = f'assets/data/words_level{level}.json'
         
-        with open(filename, 'w') as f:
-            json.dump({
-                "words": word_objects[level],
-                "level": level,
-                "count": len(word_objects[level])
-            }, f, indent=2)
+        writer.write_json(filename, {
+            "words": word_objects[level],
+            "level": level,
+            "count": len(word_objects[level])
+        })
         
         print(f"Saved {len(word_objects[level])} words to {filename}")
     
@@ -268,16 +609,21 @@ def main():
     for level in range(1, 6):
         all_words.extend(word_objects[level])
     
-    # Shuffle the combined list for even better randomization
-    random.shuffle(all_words)
+    # Shuffle the combined list for even better randomization. Seeded builds
+    # order words by a per-word hash instead, so an unchanged word keeps its
+    # relative position when other words change.
+    if seed is not None:
+        all_words.sort(key=lambda w: derive_seed(seed, 'combined', w['correctSpelling']))
+    else:
+        random.shuffle(all_words)
     
-    with open('assets/data/words_combined.json', 'w') as f:
-        json.dump({
-            "words": all_words,
-            "total_count": len(all_words)
-        }, f, indent=2)
+    writer.write_json('assets/data/words_combined.json', {
+        "words": all_words,
+        "total_count": len(all_words)
+    })
     
     print(f"Saved combined file with {len(all_words)} total words (shuffled)")
+    writer.print_summary()
     print("Done!")
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Seeding helpers shared by the word pipeline scripts.
+
+Every script accepts --seed, and MISPELT_SEED sets the same seed for the
+whole pipeline. Randomness is drawn from per-word streams derived from a hash
+of the seed and the word, so an unchanged word always gets the same result
+no matter what else changed in the build.
+"""
+
+import hashlib
+import os
+import random
+
+SEED_ENV_VAR = 'MISPELT_SEED'
+
+def resolve_seed(seed=None):
+    """
+    Return the --seed value, falling back to MISPELT_SEED (None if neither is set)
+    """
+    if seed is not None:
+        return seed
+    env_seed = os.environ.get(SEED_ENV_VAR, '').strip()
+    if env_seed:
+        return int(env_seed)
+    return None
+
+def add_seed_argument(parser):
+    """
+    Add the shared --seed option to an argparse parser
+    """
+    parser.add_argument('--seed', type=int, default=None,
+                        help=f"Seed for reproducible builds (defaults to ${SEED_ENV_VAR})")
+
+def derive_seed(seed, stream, word):
+    """
+    Derive a stable 64-bit integer from the seed, a stream name and a word
+    """
+    key = f"{seed}\0{stream}\0{word}".encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+
+def word_rng(seed, stream, word):
+    """
+    Return a Random for one word, or the global random module when unseeded
+    """
+    if seed is None:
+        return random
+    return random.Random(derive_seed(seed, stream, word))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The pipeline scripts import each other as siblings, so put scripts/ on the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,41 @@
+"""
+Atomic asset writes
+"""
+
+import gzip
+import json
+import os
+import stat
+
+import pytest
+
+from asset_writer import AssetWriter, atomic_write
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+@pytest.mark.skipif(os.name != 'posix', reason="POSIX permissions")
+def test_rewrite_keeps_the_existing_mode(tmp_path):
+    path = tmp_path / 'words.json'
+    path.write_text('{}')
+    os.chmod(path, 0o664)
+    atomic_write(str(path), b'{"words":[]}')
+    assert _mode(path) == 0o664
+    assert path.read_bytes() == b'{"words":[]}'
+
+@pytest.mark.skipif(os.name != 'posix', reason="POSIX permissions")
+def test_new_file_follows_the_umask(tmp_path):
+    old_umask = os.umask(0o022)
+    try:
+        atomic_write(str(tmp_path / 'new.json'), b'{}')
+    finally:
+        os.umask(old_umask)
+    assert _mode(tmp_path / 'new.json') == 0o644
+
+def test_write_json_is_compact_and_leaves_no_temp_files(tmp_path):
+    path = tmp_path / 'data' / 'words.json'
+    writer = AssetWriter(compress=('gz',), quiet=True)
+    writer.write_json(str(path), {"words": ["é"]})
+    assert path.read_bytes() == '{"words":["é"]}'.encode('utf-8')
+    assert json.loads(gzip.decompress((tmp_path / 'data' / 'words.json.gz').read_bytes())) == {"words": ["é"]}
+    assert sorted(os.listdir(path.parent)) == ['words.json', 'words.json.gz']
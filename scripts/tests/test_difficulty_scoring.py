@@ -0,0 +1,44 @@
+"""
+Difficulty features and quantile levels
+"""
+
+import pytest
+
+import difficulty_scoring
+from difficulty_scoring import (assign_levels, candidate_misspellings, compute_features,
+                                edit_distance, score_levels)
+
+WORDS = ['maces', 'sinew', 'laces', 'jabot', 'tidal', 'rhythm', 'photograph', 'necessary',
+         'accommodate', 'cat', 'strength', 'queue', 'separate', 'receive', 'bell', 'dog']
+
+def test_edit_distance():
+    assert edit_distance('kitten', 'sitting') == 3
+    assert edit_distance('', 'abc') == 3
+    assert edit_distance('same', 'same') == 0
+
+def test_closeness_varies_between_words():
+    closeness = list(compute_features(WORDS)['closeness'])
+    assert len(set(closeness)) > 3
+
+def test_closeness_weights_candidates_by_distance():
+    misspellings, weights = candidate_misspellings(['photograph'])
+    assert len(misspellings[0]) == len(weights[0]) == difficulty_scoring.CLOSENESS_CANDIDATES
+    expected = sum(w / max(1, edit_distance('photograph', m))
+                   for m, w in zip(misspellings[0], weights[0]))
+    assert compute_features(['photograph'])['closeness'][0] == pytest.approx(expected)
+
+def test_numpy_and_python_agree(monkeypatch):
+    if difficulty_scoring.np is None:
+        pytest.skip("NumPy is not installed")
+    with_numpy = compute_features(WORDS)
+    expected_levels = score_levels(WORDS)
+    monkeypatch.setattr(difficulty_scoring, 'np', None)
+    without_numpy = compute_features(WORDS)
+    for name, values in with_numpy.items():
+        assert list(values) == pytest.approx(without_numpy[name])
+    assert score_levels(WORDS) == expected_levels
+
+def test_assign_levels_is_balanced_and_stable():
+    levels = assign_levels([3.0, 1.0, 2.0, 1.0, 5.0, 4.0, 0.0, 2.0, 6.0, 7.0])
+    assert sorted(levels) == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+    assert levels[1] == levels[6] == 1
@@ -0,0 +1,58 @@
+"""
+MisspellingEngine generation and the incremental misspellings manifest
+"""
+
+import json
+import random
+
+from asset_writer import AssetWriter
+from improve_misspellings_better import MisspellingEngine, improve_misspellings
+
+class RecordingRandom(random.Random):
+    def shuffle(self, x):
+        self.shuffled = list(x)
+        super().shuffle(x)
+
+def test_generate_only_draws_from_applicable_rules():
+    engine = MisspellingEngine()
+    rng = RecordingRandom(3)
+    misspellings = engine.generate('photograph', 3, rng)
+    assert sorted(rng.shuffled) == sorted(engine.applicable('photograph'))
+    assert len(rng.shuffled) < len(engine.patterns)
+    assert len(misspellings) == 2
+    assert 'photograph' not in misspellings
+
+def test_generate_is_deterministic_for_a_seed():
+    engine = MisspellingEngine()
+    words = ['photograph', 'strength', 'cat', 'rhythm']
+    first = [engine.generate(word, 3, random.Random(7)) for word in words]
+    second = [engine.generate(word, 3, random.Random(7)) for word in words]
+    assert first == second
+
+def _run_improve(tmp_path):
+    improve_misspellings(seed=7, manifest_path=str(tmp_path / 'manifest.json'),
+                         writer=AssetWriter(quiet=True))
+    with open(tmp_path / 'assets' / 'data' / 'words_combined.json', encoding='utf-8') as f:
+        return json.load(f)
+
+def test_manifest_regenerates_words_rewritten_by_other_scripts(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    combined = tmp_path / 'assets' / 'data' / 'words_combined.json'
+    combined.parent.mkdir(parents=True)
+    words = [{"correctSpelling": word, "misspellings": [word + "e"], "difficulty": 2}
+             for word in ('photograph', 'strength', 'journey')]
+    combined.write_text(json.dumps({"words": words}))
+
+    improved = _run_improve(tmp_path)
+    assert all(w['misspellings'] != [w['correctSpelling'] + "e"] for w in improved['words'])
+
+    _run_improve(tmp_path)
+    assert "0 of 3 words need new misspellings" in capsys.readouterr().out
+
+    # Another script (e.g. a new parse) puts simple misspellings back
+    improved['words'][1]['misspellings'] = ["strengthe"]
+    combined.write_text(json.dumps(improved))
+    again = _run_improve(tmp_path)
+    assert "1 of 3 words need new misspellings" in capsys.readouterr().out
+    assert again['words'][1]['misspellings'] != ["strengthe"]
+    assert again['words'][0] == improved['words'][0]
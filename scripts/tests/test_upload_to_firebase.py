@@ -0,0 +1,192 @@
+"""
+Firestore uploads. The emulator tests run when a Firestore emulator is
+listening on FIRESTORE_EMULATOR_HOST (default 127.0.0.1:8080), for example
+under `firebase emulators:exec --only firestore "python -m pytest -q scripts/tests"`.
+"""
+
+import json
+import os
+import socket
+import uuid
+
+import pytest
+
+pytest.importorskip('firebase_admin')
+
+from google.api_core import exceptions as api_exceptions
+from google.auth.credentials import AnonymousCredentials
+
+import upload_to_firebase
+from upload_to_firebase import (EMULATOR_PROJECT, commit_in_chunks, connect_firestore, load_sync_manifest,
+                                migrate_document_ids, save_sync_manifest, upload_words_to_firebase, word_doc_id)
+
+def _emulator_host():
+    host = os.environ.get('FIRESTORE_EMULATOR_HOST', '127.0.0.1:8080')
+    address, _, port = host.rpartition(':')
+    try:
+        with socket.create_connection((address, int(port)), timeout=0.5):
+            return host
+    except (OSError, ValueError):
+        return None
+
+@pytest.fixture
+def emulator_db(monkeypatch):
+    host = _emulator_host()
+    if host is None:
+        pytest.skip("Firestore emulator is not running")
+    # A fresh project per test keeps the emulator's data apart
+    monkeypatch.setenv('GCLOUD_PROJECT', f"demo-test-{uuid.uuid4().hex[:8]}")
+    monkeypatch.setenv('FIRESTORE_EMULATOR_HOST', host)
+    return connect_firestore(host)
+
+def _count(db, collection_name):
+    return db.collection(collection_name).count(alias='total').get()[0][0].value
+
+def test_emulator_client_needs_no_default_credentials(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('GOOGLE_APPLICATION_CREDENTIALS', raising=False)
+    monkeypatch.delenv('GCLOUD_PROJECT', raising=False)
+    monkeypatch.setenv('FIRESTORE_EMULATOR_HOST', '')
+    db = connect_firestore('127.0.0.1:9')
+    assert db.project == EMULATOR_PROJECT
+    assert isinstance(db._credentials, AnonymousCredentials)
+    assert os.environ['FIRESTORE_EMULATOR_HOST'] == '127.0.0.1:9'
+
+class InMemoryFirestore:
+    """
+    Just enough of a Firestore client for upload_words_to_firebase
+    """
+
+    project = 'demo-memory'
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def collection(self, name):
+        return self
+
+    def document(self, doc_id):
+        return doc_id
+
+    def stream(self):
+        return [_Snapshot(doc_id, data) for doc_id, data in self.docs.items()]
+
+    def count(self, alias=None):
+        return _Count(len(self.docs))
+
+    def get_all(self, doc_ids):
+        return [_Snapshot(doc_id, self.docs.get(doc_id)) for doc_id in doc_ids]
+
+    def batch(self):
+        return _Batch(self)
+
+class _Snapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+class _Count:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return [[self]]
+
+class _Batch:
+    def __init__(self, db):
+        self.db = db
+        self.writes = []
+
+    def set(self, doc_id, data, merge=False):
+        self.writes.append((doc_id, data))
+
+    def update(self, doc_id, data):
+        if doc_id not in self.db.docs:
+            raise api_exceptions.NotFound(f"No document to update: {doc_id}")
+        self.writes.append((doc_id, data))
+
+    def commit(self):
+        for doc_id, data in self.writes:
+            self.db.docs[doc_id] = dict(data)
+
+def test_stale_manifest_is_discarded_and_rebuilt(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manifest = str(tmp_path / 'manifest.json')
+    apple = {"correctSpelling": "apple", "misspellings": ["aple"], "difficulty": 1}
+    # The app's admin sync rekeyed autoA to a word-keyed document
+    db = InMemoryFirestore({'apple': dict(apple)})
+    monkeypatch.setattr(upload_to_firebase, 'connect_firestore', lambda emulator=None: db)
+    save_sync_manifest(manifest, f"{db.project}@firestore",
+                       {'apple': {'doc_id': 'autoA', 'hash': upload_to_firebase.content_hash(apple)}})
+    _write_words([dict(apple, misspellings=["appel"])])
+
+    upload_words_to_firebase(assume_yes=True, manifest_path=manifest)
+    assert not os.path.exists(manifest)
+    assert db.docs == {'apple': apple}
+
+    upload_words_to_firebase(assume_yes=True, manifest_path=manifest)
+    assert db.docs['apple']['misspellings'] == ["appel"]
+    assert load_sync_manifest(manifest, f"{db.project}@firestore")['apple']['doc_id'] == 'apple'
+
+def test_pack_groups_never_exceeds_the_batch_limit():
+    groups = [[('set', str(i), {})] * (1 + i % 3) for i in range(700)]
+    chunks = upload_to_firebase.pack_groups(groups, batch_size=1000)
+    assert all(len(chunk) <= upload_to_firebase.MAX_BATCH_WRITES for chunk in chunks)
+    assert sum(map(len, chunks)) == sum(map(len, groups))
+
+def test_commit_more_than_one_batch_to_the_emulator(emulator_db):
+    words = [f"word{i}" for i in range(1203)]
+    ops = [('set', word_doc_id(word), {"correctSpelling": word, "misspellings": [word + "e"],
+                                       "difficulty": 1 + i % 5})
+           for i, word in enumerate(words)]
+
+    assert commit_in_chunks(emulator_db, ops, parallel=3) == []
+    assert _count(emulator_db, 'words') == len(words)
+    doc = emulator_db.collection('words').document(word_doc_id('word42')).get()
+    assert doc.to_dict()['misspellings'] == ['word42e']
+
+    deletes = [('delete', word_doc_id(word), None) for word in words[:600]]
+    assert commit_in_chunks(emulator_db, deletes) == []
+    assert _count(emulator_db, 'words') == len(words) - 600
+
+def _write_words(words):
+    os.makedirs('assets/data', exist_ok=True)
+    with open('assets/data/words_combined.json', 'w', encoding='utf-8') as f:
+        json.dump({"words": words}, f)
+
+def _doc_ids(db):
+    return sorted(doc.id for doc in db.collection('words').stream())
+
+def test_uploads_keep_a_migrated_collection_word_keyed(emulator_db, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    host = os.environ['FIRESTORE_EMULATOR_HOST']
+    manifest = str(tmp_path / 'manifest.json')
+    words = [{"correctSpelling": word, "misspellings": [word + "e"], "difficulty": 1}
+             for word in ('apple', 'zebra')]
+    # Documents written with auto IDs before the migration
+    for word_data in words:
+        emulator_db.collection('words').document().set(word_data)
+    _write_words(words)
+
+    # Blind upserts would duplicate every word, so they are refused
+    upload_words_to_firebase(assume_yes=True, emulator=host, manifest_path=manifest, upsert=True)
+    assert len(_doc_ids(emulator_db)) == 2
+    assert not os.path.exists(manifest)
+
+    migrate_document_ids(assume_yes=True, emulator=host, manifest_path=manifest)
+    assert _doc_ids(emulator_db) == ['apple', 'zebra']
+
+    words.append({"correctSpelling": "zebraish", "misspellings": ["zebrish"], "difficulty": 2})
+    _write_words(words)
+    upload_words_to_firebase(assume_yes=True, emulator=host, manifest_path=manifest)
+    assert _doc_ids(emulator_db) == ['apple', 'zebra', 'zebraish']
+
+    words[0]['misspellings'] = ['aple']
+    _write_words(words)
+    upload_words_to_firebase(assume_yes=True, emulator=host, manifest_path=manifest, upsert=True)
+    assert _doc_ids(emulator_db) == ['apple', 'zebra', 'zebraish']
+    assert emulator_db.collection('words').document('apple').get().to_dict()['misspellings'] == ['aple']
@@ -0,0 +1,208 @@
+"""
+DictionaryClient and TokenBucket against a local stand-in for the dictionary API
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import validate_with_optimized
+from asset_writer import AssetWriter
+from validate_with_optimized import (DictionaryClient, TokenBucket, ValidationJournal, process_batch_optimized,
+                                     validate_words_optimized)
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        word = self.path.rsplit('/', 1)[-1]
+        with server.lock:
+            server.requests.append(word)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            rate_limited = word == 'limited' and server.requests.count(word) == 1
+        try:
+            time.sleep(server.delay)
+            if rate_limited:
+                self._reply(429, {"message": "slow down"}, {'Retry-After': '1'})
+            elif word.startswith('missing'):
+                self._reply(404, {"title": "No Definitions Found"})
+            else:
+                self._reply(200, [{"meanings": [{"definitions": [{"definition": f"meaning of {word}"}]}]}])
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _reply(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stand_in():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.delay = 0.05
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def make_client(server, pool_size=4):
+    api_url = f"http://127.0.0.1:{server.server_address[1]}/entries/{{word}}"
+    # A generous budget so the bucket never paces the tests
+    limiter = TokenBucket(requests_per_window=10000, window=1, burst=100)
+    return DictionaryClient(api_url, limiter, pool_size=pool_size, backoff_factor=0.01)
+
+def test_lookups_run_concurrently_within_the_pool(stand_in):
+    words = [f"word{i}" for i in range(16)]
+    with make_client(stand_in, pool_size=4) as client:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(client.lookup, words))
+        sent, opened, reused = client.connection_stats()
+
+    assert results == [(True, f"meaning of {word}") for word in words]
+    assert 1 < stand_in.max_in_flight <= 4
+    assert sent == len(words)
+    assert opened <= 4
+    assert reused >= len(words) - 4
+
+def test_429_pauses_for_retry_after_then_succeeds(stand_in):
+    with make_client(stand_in) as client:
+        start = time.monotonic()
+        result = client.lookup('limited')
+        elapsed = time.monotonic() - start
+        rate_after = client.limiter.rate
+
+    assert result == (True, "meaning of limited")
+    assert stand_in.requests.count('limited') == 2
+    assert elapsed >= 1.0
+    # The 429 halved the rate and the success only raised it back a little
+    assert rate_after < client.limiter.max_rate
+    assert client.limiter.consecutive_429s == 0
+
+def test_404_is_an_invalid_word_without_retries(stand_in):
+    with make_client(stand_in) as client:
+        assert client.lookup('missingword') == (False, "")
+    assert stand_in.requests == ['missingword']
+
+def test_throttle_pauses_every_worker():
+    limiter = TokenBucket(requests_per_window=10000, window=1, burst=5)
+    assert limiter.throttle(retry_after=0.3) == pytest.approx(0.3, abs=0.05)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.25
+
+def test_cancel_wakes_paused_workers():
+    limiter = TokenBucket(requests_per_window=10000, window=1, burst=5)
+    limiter.throttle(retry_after=20)
+    threading.Timer(0.1, limiter.cancel).start()
+    start = time.monotonic()
+    assert limiter.acquire() is False
+    assert time.monotonic() - start < 2
+
+def test_interrupt_does_not_wait_out_a_429_pause(stand_in, monkeypatch):
+    def interrupted(futures):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(validate_with_optimized, 'as_completed', interrupted)
+    with make_client(stand_in) as client:
+        client.limiter.throttle(retry_after=20)
+        words = [{"correctSpelling": f"word{i}", "misspellings": []} for i in range(8)]
+        start = time.monotonic()
+        with pytest.raises(KeyboardInterrupt):
+            process_batch_optimized(words, 1, 1, concurrency=4, client=client)
+        assert time.monotonic() - start < 2
+    assert stand_in.requests == []
+
+class WordSet:
+    def __init__(self, words):
+        self.words = set(words)
+
+    def contains(self, word):
+        return word in self.words
+
+def test_resumed_run_backs_up_the_unvalidated_level(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / 'assets' / 'data'
+    data_dir.mkdir(parents=True)
+    levels = {}
+    for level in range(1, 6):
+        levels[level] = {"words": [
+            {"correctSpelling": f"word{level}", "misspellings": [f"wrod{level}"], "difficulty": level},
+            {"correctSpelling": f"bogus{level}", "misspellings": [f"bgous{level}"], "difficulty": level},
+        ]}
+        (data_dir / f'words_level{level}.json').write_text(json.dumps(levels[level]))
+    (data_dir / 'words_level2_backup.json').write_text('"STALE"')
+
+    # Level 1 was finished by the interrupted run
+    journal = ValidationJournal(str(tmp_path / 'journal.jsonl'))
+    journal.complete_level(1)
+    journal.close()
+    journal = ValidationJournal(str(tmp_path / 'journal.jsonl'), resume=True)
+
+    backend = WordSet(f"word{level}" for level in range(1, 6))
+    validate_words_optimized(journal=journal, backend=backend, offline=True,
+                             writer=AssetWriter(quiet=True))
+    journal.close()
+
+    assert not (data_dir / 'words_level1_backup.json').exists()
+    assert json.loads((data_dir / 'words_level2_backup.json').read_text()) == levels[2]
+    validated = json.loads((data_dir / 'words_level2.json').read_text())
+    assert [w['correctSpelling'] for w in validated['words']] == ['word2']
+
+class NotFoundClient:
+    limiter = None
+
+    def __init__(self):
+        self.looked_up = []
+
+    def lookup(self, word):
+        self.looked_up.append(word)
+        return False, ""
+
+class NotFoundCache:
+    def get(self, word):
+        return False, ""
+
+    def put(self, word, valid, definition):
+        pass
+
+def test_local_hit_stays_valid_when_the_api_has_no_entry(tmp_path):
+    journal = ValidationJournal(str(tmp_path / 'journal.jsonl'))
+    client = NotFoundClient()
+    words = [{"correctSpelling": "sinew", "misspellings": ["sinnew"]},
+             {"correctSpelling": "zzyzx", "misspellings": ["zyzzx"]}]
+    valid, invalid, errors = process_batch_optimized(
+        words, 1, 1, concurrency=2, journal=journal, level=1, client=client,
+        backend=WordSet(['sinew']))
+    journal.close()
+
+    assert sorted(client.looked_up) == ['sinew', 'zzyzx']
+    assert [w['correctSpelling'] for w in valid] == ['sinew']
+    assert (invalid, errors) == (['zzyzx'], [])
+    assert journal.get(1, 'sinew') == (True, "")
+
+def test_local_hit_stays_valid_with_a_cached_404():
+    words = [{"correctSpelling": "sinew", "misspellings": ["sinnew"]}]
+    valid, invalid, errors = process_batch_optimized(
+        words, 1, 1, client=NotFoundClient(), cache=NotFoundCache(), backend=WordSet(['sinew']))
+    assert [w['correctSpelling'] for w in valid] == ['sinew']
+    assert invalid == []
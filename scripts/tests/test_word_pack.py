@@ -0,0 +1,67 @@
+"""
+Word pack encoding round trips
+"""
+
+import pytest
+
+from word_pack import WordPack, encode_word_pack, read_varint, verify_round_trip, write_varint
+
+LEVELS = {
+    1: [
+        {"correctSpelling": "cat", "misspellings": ["kat", "catt"], "difficulty": 1, "definition": "A small feline."},
+        {"correctSpelling": "dog", "misspellings": ["dogg", "dgo"], "difficulty": 1, "definition": ""},
+    ],
+    2: [
+        {"correctSpelling": "café", "misspellings": ["cafe", "caffé"], "difficulty": 2, "definition": "A coffee shop."},
+    ],
+    5: [
+        {"correctSpelling": "rhythm", "misspellings": ["rythm", "rhythym", "rhytm"], "difficulty": 5,
+         "definition": "A strong, regular, repeated pattern of movement or sound. " * 5},
+    ],
+}
+COMBINED = [LEVELS[5][0], LEVELS[1][1], LEVELS[2][0], LEVELS[1][0]]
+
+@pytest.mark.parametrize('value', [0, 1, 127, 128, 300, 2 ** 32 + 5])
+def test_varint_round_trip(value):
+    out = bytearray(b'x')
+    write_varint(out, value)
+    assert read_varint(bytes(out), 1) == (value, len(out))
+
+def test_varint_rejects_negative_values():
+    with pytest.raises(ValueError):
+        write_varint(bytearray(), -1)
+
+def test_levels_and_combined_order_round_trip():
+    pack = WordPack(encode_word_pack(LEVELS, COMBINED))
+    assert pack.levels == [1, 2, 5]
+    for level, words in LEVELS.items():
+        assert pack.level(level) == words
+    assert pack.combined() == COMBINED
+    assert verify_round_trip(pack, LEVELS, COMBINED) == []
+
+def test_strings_are_stored_once():
+    levels = {1: [{"correctSpelling": "word", "misspellings": ["wrod"], "difficulty": 1,
+                   "definition": "shared " * 20}],
+              2: [{"correctSpelling": "other", "misspellings": ["othr"], "difficulty": 2,
+                   "definition": "shared " * 20}]}
+    data = encode_word_pack(levels, [])
+    assert data.count(("shared " * 20).encode('utf-8')) == 1
+
+def test_verify_reports_changed_json():
+    pack = WordPack(encode_word_pack(LEVELS, COMBINED))
+    changed = {**LEVELS, 1: [dict(LEVELS[1][0], misspellings=["kat"]), LEVELS[1][1]]}
+    assert verify_round_trip(pack, changed, COMBINED) == ["level 1 differs from the JSON"]
+    assert verify_round_trip(pack, LEVELS, COMBINED[1:]) == ["combined order or contents differ from the JSON"]
+
+def test_combined_word_missing_from_levels_is_rejected():
+    extra = {"correctSpelling": "ghost", "misspellings": ["gost"], "difficulty": 3}
+    with pytest.raises(ValueError):
+        encode_word_pack(LEVELS, COMBINED + [extra])
+
+def test_rejects_other_files_and_versions():
+    with pytest.raises(ValueError):
+        WordPack(b'{"words": []}')
+    data = bytearray(encode_word_pack(LEVELS, COMBINED))
+    data[4] = 99
+    with pytest.raises(ValueError):
+        WordPack(bytes(data))
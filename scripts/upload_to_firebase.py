@@ -1,11 +1,421 @@
+import argparse
+import hashlib
 import json
 import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.api_core import exceptions as api_exceptions
+from google.auth.credentials import AnonymousCredentials
+
+from asset_writer import atomic_write
+
+# Firestore rejects batches with more than 500 writes
+MAX_BATCH_WRITES = 500
+DEFAULT_PARALLEL_BATCHES = 4
+DEFAULT_MAX_RETRIES = 5
+
+# Last-synced state of the words collection, so a run can diff offline
+SYNC_MANIFEST_FILE = '.cache/firestore_sync_manifest.json'
+
+# Characters kept as they are in word-keyed document IDs
+DOC_ID_SAFE_RE = re.compile(r'[a-z0-9-]')
+
+# Project used with --emulator unless GCLOUD_PROJECT is set
+EMULATOR_PROJECT = 'demo-mispelt'
+
+# How many written documents are read back after an upload
+DEFAULT_SPOT_CHECK = 20
+
+# Fields whose changes are uploaded
+CHANGE_FIELDS = ['correctSpelling', 'misspellings', 'definition', 'difficulty']
+
+# BulkWriter's "500/50/5" ramp-up: start at 500 writes per second and allow
+# 50% more every 5 minutes, up to a ceiling
+INITIAL_WRITES_PER_SECOND = 500
+RAMP_UP_FACTOR = 1.5
+RAMP_UP_INTERVAL = 5 * 60
+MAX_WRITES_PER_SECOND = 10000
+
+# Errors worth retrying a whole batch for
+RETRYABLE_ERRORS = (
+    api_exceptions.Aborted,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.InternalServerError,
+    api_exceptions.ResourceExhausted,
+    api_exceptions.ServiceUnavailable,
+)
+
+class WriteThrottle:
+    """
+    Token bucket of writes per second that ramps up like Firestore's BulkWriter
+    """
+
+    def __init__(self, initial_rate=INITIAL_WRITES_PER_SECOND, max_rate=MAX_WRITES_PER_SECOND):
+        self.rate = initial_rate
+        self.max_rate = max_rate
+        self.tokens = float(initial_rate)
+        self.started = self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        ramps = int((now - self.started) // RAMP_UP_INTERVAL)
+        self.rate = min(self.max_rate, INITIAL_WRITES_PER_SECOND * RAMP_UP_FACTOR ** ramps)
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, writes):
+        """
+        Block until writes (at most one batch) may be sent
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                # A batch larger than the bucket waits for a full bucket
+                needed = min(writes, self.rate)
+                if self.tokens >= needed:
+                    self.tokens -= writes
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(wait)
+
+def word_doc_id(word):
+    """
+    Stable document ID for a word: the trimmed, lowercased word, with any
+    character outside a-z, 0-9 and '-' written as ~ and six hex digits.
+
+    WordDatabaseService.wordDocId in the app builds the same IDs.
+    """
+    normalized = word.strip().lower()
+    return ''.join(char if DOC_ID_SAFE_RE.match(char) else f"~{ord(char):06x}" for char in normalized)
+
+def _apply(batch, db, op, collection_name='words'):
+    kind, doc_id, data = op
+    collection = db.collection(collection_name)
+    doc_ref = collection.document(doc_id) if doc_id else collection.document()
+    if kind == 'set':
+        batch.set(doc_ref, data)
+    elif kind == 'merge':
+        batch.set(doc_ref, data, merge=True)
+    elif kind == 'update':
+        batch.update(doc_ref, data)
+    elif kind == 'delete':
+        batch.delete(doc_ref)
+    else:
+        raise ValueError(f"Unknown write '{kind}'")
+
+def commit_chunk(db, chunk, max_retries=DEFAULT_MAX_RETRIES, collection_name='words'):
+    """
+    Commit one batch of at most 500 writes, retrying transient errors.
+
+    Returns (seconds spent, retries used). A batch is atomic, so retrying
+    the whole of it never applies a write twice.
+    """
+    start = time.monotonic()
+    for attempt in range(max_retries + 1):
+        batch = db.batch()
+        for op in chunk:
+            _apply(batch, db, op, collection_name)
+        try:
+            batch.commit()
+            return time.monotonic() - start, attempt
+        except RETRYABLE_ERRORS:
+            if attempt >= max_retries:
+                raise
+            # Exponential backoff with jitter so parallel batches spread out
+            time.sleep(min(60, 2 ** attempt) * (0.5 + random.random()))
+
+def pack_groups(groups, batch_size=MAX_BATCH_WRITES):
+    """
+    Pack groups of writes into batches of at most batch_size writes,
+    never splitting a group, so each group is applied atomically
+    """
+    batch_size = max(1, min(batch_size, MAX_BATCH_WRITES))
+    chunks = []
+    chunk = []
+    for group in groups:
+        if chunk and len(chunk) + len(group) > batch_size:
+            chunks.append(chunk)
+            chunk = []
+        chunk.extend(group)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def commit_in_chunks(db, ops, batch_size=MAX_BATCH_WRITES, parallel=DEFAULT_PARALLEL_BATCHES,
+                     max_retries=DEFAULT_MAX_RETRIES, throttle=None, groups=None,
+                     collection_name='words'):
+    """
+    Commit ('set' | 'merge' | 'update' | 'delete', doc_id, data) writes in
+    batches of at most batch_size, with up to parallel batches in flight.
+    Pass groups (lists of writes) instead of ops to keep writes together.
+    Writes go to the words collection unless collection_name says otherwise.
+
+    Prints the latency of every batch and returns the list of batches that
+    still failed after their retries, as (writes, error).
+    """
+    chunks = pack_groups(groups if groups is not None else [[op] for op in ops], batch_size)
+    throttle = throttle or WriteThrottle()
+    latencies = []
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+        futures = {}
+        for number, chunk in enumerate(chunks, 1):
+            throttle.acquire(len(chunk))
+            futures[executor.submit(commit_chunk, db, chunk, max_retries, collection_name)] = (number, chunk)
 
-def upload_words_to_firebase():
+        for future in as_completed(futures):
+            number, chunk = futures[future]
+            try:
+                latency, retries = future.result()
+            except Exception as e:
+                print(f"   ❌ Batch {number}/{len(chunks)}: {len(chunk)} writes failed: {e}")
+                failed.append((chunk, e))
+                continue
+            latencies.append(latency)
+            retry_note = f" after {retries} retries" if retries else ""
+            print(f"   Batch {number}/{len(chunks)}: {len(chunk)} writes in {latency:.2f}s{retry_note}")
+
+    if latencies:
+        latencies.sort()
+        print(f"   Batch latency: median {latencies[len(latencies) // 2]:.2f}s, max {latencies[-1]:.2f}s")
+    return failed
+
+def content_hash(word_data):
+    """
+    Hash of the fields that decide whether a word needs uploading.
+
+    Misspellings are compared as a set, so reordering them is not a change.
+    """
+    values = []
+    for field in CHANGE_FIELDS:
+        value = word_data.get(field)
+        if isinstance(value, list):
+            value = sorted(set(value))
+        values.append(value)
+    return hashlib.sha1(json.dumps(values, sort_keys=True).encode('utf-8')).hexdigest()
+
+def load_sync_manifest(path, target):
+    """
+    Return {word: {'doc_id', 'hash'}} from the last sync with target, or None
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('target') != target:
+        return None
+    return manifest.get('words', {})
+
+def save_sync_manifest(path, target, words):
+    manifest = {"version": 1, "target": target, "words": words}
+    atomic_write(path, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+def discard_sync_manifest(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def fetch_remote_state(db):
+    """
+    Stream the whole words collection into {word: {'doc_id', 'hash'}}
+    """
+    remote = {}
+    for doc in db.collection('words').stream():
+        data = doc.to_dict()
+        correct_spelling = data.get('correctSpelling', '').lower()
+        if correct_spelling:
+            remote[correct_spelling] = {'doc_id': doc.id, 'hash': content_hash(data)}
+    return remote
+
+def initialize_firebase():
+    """
+    Initialize the Admin SDK; returns False (after explaining why) on failure
+    """
+    try:
+        if os.path.exists('firebase-service-account.json'):
+            cred = credentials.Certificate('firebase-service-account.json')
+            firebase_admin.initialize_app(cred)
+            print("✅ Firebase initialized with service account key")
+        else:
+            firebase_admin.initialize_app()
+            print("✅ Firebase initialized with default credentials")
+    except Exception as e:
+        print(f"❌ Error initializing Firebase: {e}")
+        print("\nTo fix this, you need to:")
+        print("1. Download your Firebase service account key from Firebase Console")
+        print("2. Save it as 'firebase-service-account.json' in your project root")
+        print("3. Or set up Firebase CLI and run 'firebase login'")
+        return False
+    return True
+
+def connect_firestore(emulator=None):
+    """
+    Return a Firestore client, or None (after explaining why) on failure.
+
+    The emulator accepts any credentials, so its client is built with
+    anonymous ones instead of looking for application-default credentials.
+    """
+    if emulator:
+        os.environ['FIRESTORE_EMULATOR_HOST'] = emulator
+        project = os.environ.get('GCLOUD_PROJECT', EMULATOR_PROJECT)
+        db = firestore.Client(project=project, credentials=AnonymousCredentials())
+        print(f"✅ Connected to the Firestore emulator at {emulator} (project {project})")
+        return db
+
+    if not initialize_firebase():
+        return None
+    try:
+        return firestore.client()
+    except Exception as e:
+        print(f"❌ Error creating the Firestore client: {e}")
+        print("Save a service account key as 'firebase-service-account.json' or use --emulator")
+        return None
+
+def count_words(db):
+    """
+    Server-side count of the words collection (one aggregation query,
+    billed per 1000 index entries instead of per document)
+    """
+    results = db.collection('words').count(alias='total').get()
+    return results[0][0].value
+
+def spot_check(db, ops, sample_size=DEFAULT_SPOT_CHECK):
+    """
+    Read back a random sample of written documents by ID and compare them
+    with what was written; returns (checked, mismatched words)
+    """
+    writes = [op for op in ops if op[0] != 'delete']
+    sample = random.sample(writes, min(sample_size, len(writes)))
+    if not sample:
+        return 0, []
+    collection = db.collection('words')
+    expected = {doc_id: data for _, doc_id, data in sample}
+    mismatched = []
+    found = set()
+    for snapshot in db.get_all([collection.document(doc_id) for doc_id in expected]):
+        found.add(snapshot.id)
+        data = expected[snapshot.id]
+        if not snapshot.exists or content_hash(snapshot.to_dict()) != content_hash(data):
+            mismatched.append(data['correctSpelling'])
+    mismatched += [data['correctSpelling'] for doc_id, data in expected.items() if doc_id not in found]
+    return len(sample), mismatched
+
+def verify_upload(db, ops, before_count, created, sample_size=DEFAULT_SPOT_CHECK):
+    """
+    Check the upload with an aggregation count and a spot-check of the
+    written documents, so the cost scales with the change set.
+
+    created is how many documents the upload should have added, or None
+    when that is unknown.
+    """
+    after_count = count_words(db)
+    print(f"✅ Verification: {after_count} documents in the words collection")
+    ok = True
+    if before_count is not None and created is not None:
+        expected_total = before_count + created
+        if after_count != expected_total:
+            print(f"⚠️ Warning: Expected {expected_total} documents, but found {after_count}")
+            ok = False
+    
+    checked, mismatched = spot_check(db, ops, sample_size)
+    if mismatched:
+        print(f"⚠️ Warning: {len(mismatched)} of {checked} spot-checked words don't match: "
+              f"{', '.join(mismatched[:5])}")
+        ok = False
+    elif checked:
+        print(f"✅ Spot-checked {checked} written words")
+    
+    if ok:
+        print("🎉 Upload successful! All changes have been applied.")
+    return ok
+
+def sync_target(db, emulator=None):
+    return f"{db.project}@{emulator or 'firestore'}"
+
+def migrate_document_ids(batch_size=MAX_BATCH_WRITES, parallel=DEFAULT_PARALLEL_BATCHES,
+                         max_retries=DEFAULT_MAX_RETRIES, assume_yes=False, emulator=None,
+                         manifest_path=SYNC_MANIFEST_FILE):
+    """
+    One-time migration of auto-ID word documents to word-keyed IDs.
+
+    Each word's document is copied to its word_doc_id and the old one (plus
+    any duplicate documents for the same word) deleted in the same batch.
+    """
+    print("Migrating word documents to word-keyed IDs...")
+    db = connect_firestore(emulator)
+    if db is None:
+        return
+    
+    docs_by_word = {}
+    for doc in db.collection('words').stream():
+        data = doc.to_dict()
+        correct_spelling = data.get('correctSpelling', '').lower()
+        if correct_spelling:
+            docs_by_word.setdefault(correct_spelling, []).append((doc.id, data))
+    print(f"📊 Found {sum(len(docs) for docs in docs_by_word.values())} word documents "
+          f"for {len(docs_by_word)} words")
+    
+    groups = []
+    synced = {}
+    for word, docs in docs_by_word.items():
+        new_id = word_doc_id(word)
+        # Prefer a document that already has the right ID
+        keep_id, keep_data = next(((i, d) for i, d in docs if i == new_id), docs[0])
+        group = [] if keep_id == new_id else [('set', new_id, keep_data)]
+        group += [('delete', doc_id, None) for doc_id, _ in docs if doc_id != new_id]
+        if group:
+            groups.append(group)
+        synced[word] = {'doc_id': new_id, 'hash': content_hash(keep_data)}
+    
+    if not groups:
+        print("✅ Every word document already uses its word-keyed ID")
+    else:
+        writes = sum(len(group) for group in groups)
+        print(f"This will rekey {len(groups)} words ({writes} writes)")
+        if not assume_yes and sys.stdin.isatty():
+            response = input("\nContinue with migration? (y/n): ").lower().strip()
+            if response != 'y':
+                print("Cancelled.")
+                return
+        failed = commit_in_chunks(db, None, batch_size, parallel, max_retries, groups=groups)
+        if failed:
+            print(f"❌ {len(failed)} batches failed; rerun --migrate-ids to finish the migration")
+            return
+        print(f"✅ Rekeyed {len(groups)} words")
+    
+    try:
+        save_sync_manifest(manifest_path, sync_target(db, emulator), synced)
+    except OSError as e:
+        print(f"⚠️ Warning: Could not save sync manifest {manifest_path}: {e}")
+    print("🎉 Migration complete. Upload with --upsert from now on.")
+
+def upload_words_to_firebase(batch_size=MAX_BATCH_WRITES, parallel=DEFAULT_PARALLEL_BATCHES,
+                             max_retries=DEFAULT_MAX_RETRIES, assume_yes=False, emulator=None,
+                             manifest_path=SYNC_MANIFEST_FILE, verify_remote=False, upsert=False,
+                             spot_check_size=DEFAULT_SPOT_CHECK):
     """
     Upload words from words_combined.json to Firebase Firestore with change detection
+
+    Changes are found by diffing against the local sync manifest written by
+    the last upload. The collection is only streamed when there is no
+    manifest for this project yet, or with verify_remote.
+
+    New words always get word-keyed documents (word_doc_id). With upsert,
+    changed words are written with set(merge=True) instead of update().
+    Upserting needs to know the collection has no auto-ID documents, so it
+    refuses to run without a manifest (written by --migrate-ids or an
+    earlier upload) unless verify_remote streams the collection first.
     """
     print("Uploading words to Firebase Firestore...")
     
@@ -25,43 +435,43 @@ def upload_words_to_firebase():
         print(f"❌ Error loading words: {e}")
         return
     
-    # Initialize Firebase
-    try:
-        if os.path.exists('firebase-service-account.json'):
-            cred = credentials.Certificate('firebase-service-account.json')
-            firebase_admin.initialize_app(cred)
-            print("✅ Firebase initialized with service account key")
-        else:
-            firebase_admin.initialize_app()
-            print("✅ Firebase initialized with default credentials")
-    except Exception as e:
-        print(f"❌ Error initializing Firebase: {e}")
-        print("\nTo fix this, you need to:")
-        print("1. Download your Firebase service account key from Firebase Console")
-        print("2. Save it as 'firebase-service-account.json' in your project root")
-        print("3. Or set up Firebase CLI and run 'firebase login'")
+    # Initialize Firebase and get the Firestore client
+    db = connect_firestore(emulator)
+    if db is None:
         return
     
-    # Get Firestore client
-    db = firestore.client()
-    
     # Check existing words and detect changes
     print("🔍 Checking for existing words and changes...")
-    existing_words = {}
-    try:
-        existing_docs = db.collection('words').stream()
-        for doc in existing_docs:
-            data = doc.to_dict()
-            correct_spelling = data.get('correctSpelling', '').lower()
-            if correct_spelling:
-                existing_words[correct_spelling] = {
-                    'doc_id': doc.id,
-                    'data': data
-                }
-        print(f"📊 Found {len(existing_words)} existing words in Firestore")
-    except Exception as e:
-        print(f"⚠️ Warning: Could not check existing words: {e}")
-        existing_words = {}
+    target = sync_target(db, emulator)
+    existing_words = None if verify_remote else load_sync_manifest(manifest_path, target)
+    if existing_words is not None:
+        print(f"📋 Using sync manifest {manifest_path} ({len(existing_words)} words, no reads needed)")
+    elif upsert:
+        # Blind upserts into a collection of auto-ID documents would
+        # create a second document for every word
+        print(f"❌ No sync manifest for {target}; run --migrate-ids first, "
+              f"or --upsert --verify-remote to check the collection")
+        return
+    else:
+        try:
+            existing_words = fetch_remote_state(db)
+            print(f"📊 Found {len(existing_words)} existing words in Firestore")
+        except Exception as e:
+            print(f"❌ Error: Could not check existing words: {e}")
+            return
+        if verify_remote:
+            manifest = load_sync_manifest(manifest_path, target) or {}
+            drifted = sum(1 for word, entry in existing_words.items() if manifest.get(word) != entry)
+            drifted += sum(1 for word in manifest if word not in existing_words)
+            print(f"🔎 Remote reconcile: {drifted} words differed from the local manifest")
+    
+    if upsert:
+        # Upserting over auto-ID documents would leave duplicates behind
+        unmigrated = [word for word, entry in existing_words.items() if entry['doc_id'] != word_doc_id(word)]
+        if unmigrated:
+            print(f"❌ {len(unmigrated)} words still have auto-ID documents "
+                  f"(e.g. {', '.join(unmigrated[:3])}); run --migrate-ids first")
+            return
     
     # Analyze changes
     new_words = []
@@ -74,9 +484,8 @@ def upload_words_to_firebase():
             continue
             
         if correct_spelling in existing_words:
-            existing_data = existing_words[correct_spelling]['data']
             # Check if data has changed
-            if _has_changes(word_data, existing_data):
+            if content_hash(word_data) != existing_words[correct_spelling]['hash']:
                 updated_words.append({
                     'doc_id': existing_words[correct_spelling]['doc_id'],
                     'data': word_data
@@ -103,6 +512,10 @@ def upload_words_to_firebase():
     # Confirm changes
     if len(new_words) == 0 and len(updated_words) == 0:
         print("\n✅ No changes detected. All words are up to date!")
+        try:
+            save_sync_manifest(manifest_path, target, existing_words)
+        except OSError as e:
+            print(f"⚠️ Warning: Could not save sync manifest {manifest_path}: {e}")
         return
     
     print(f"\nThis will:")
@@ -111,74 +524,93 @@ def upload_words_to_firebase():
     if len(updated_words) > 0:
         print(f"   - Update {len(updated_words)} existing words")
     
-    response = input("\nContinue with upload? (y/n): ").lower().strip()
-    if response != 'y':
-        print("Cancelled.")
-        return
+    # Only ask when a person is at the terminal, so uploads can run unattended
+    if not assume_yes and sys.stdin.isatty():
+        response = input("\nContinue with upload? (y/n): ").lower().strip()
+        if response != 'y':
+            print("Cancelled.")
+            return
     
-    # Upload changes
+    # Upload changes in batches Firestore accepts, several at a time. New
+    # words get word-keyed documents so a migrated collection stays migrated.
+    if upsert:
+        ops = [('merge', word_doc_id(word_data['correctSpelling']), word_data)
+               for word_data in new_words + [info['data'] for info in updated_words]]
+    else:
+        ops = [('set', word_doc_id(word_data['correctSpelling']), word_data) for word_data in new_words]
+        ops += [('update', info['doc_id'], info['data']) for info in updated_words]
     try:
-        print("\n📤 Uploading changes to Firestore...")
-        batch = db.batch()
-        
-        # Add new words
-        for i, word_data in enumerate(new_words):
-            doc_ref = db.collection('words').document()
-            batch.set(doc_ref, word_data)
-            if (i + 1) % 25 == 0:
-                print(f"   Added {i + 1}/{len(new_words)} new words...")
-        
-        # Update existing words
-        for i, update_info in enumerate(updated_words):
-            doc_ref = db.collection('words').document(update_info['doc_id'])
-            batch.update(doc_ref, update_info['data'])
-            if (i + 1) % 25 == 0:
-                print(f"   Updated {i + 1}/{len(updated_words)} existing words...")
-        
-        # Commit the batch
-        batch.commit()
-        print(f"✅ Successfully uploaded changes to Firestore!")
-        
+        before_count = count_words(db)
     except Exception as e:
-        print(f"❌ Error uploading words: {e}")
+        print(f"⚠️ Warning: Could not count existing documents: {e}")
+        before_count = None
+    print(f"\n📤 Uploading {len(ops)} changes to Firestore in batches of up to {batch_size}...")
+    failed = commit_in_chunks(db, ops, batch_size, parallel, max_retries)
+    
+    # An update of a missing document means the manifest no longer matches
+    # Firestore (e.g. the app's admin sync rekeyed or removed documents).
+    # Retrying from it would fail the same way every time, so drop it and
+    # let the next run read the collection again.
+    missing = [chunk for chunk, error in failed if isinstance(error, api_exceptions.NotFound)]
+    if missing:
+        try:
+            discard_sync_manifest(manifest_path)
+        except OSError as e:
+            print(f"⚠️ Warning: Could not remove sync manifest {manifest_path}: {e}")
+        print(f"❌ {len(missing)} batches failed because documents in the sync manifest no longer exist.")
+        print("   The manifest was discarded; rerun (with --verify-remote when upserting) "
+              "to rebuild it from Firestore")
+        return
+    
+    # Record what is now in Firestore; failed writes stay out of the
+    # manifest so the next run retries them
+    failed_ids = {doc_id for chunk, _ in failed for _, doc_id, _ in chunk}
+    synced = dict(existing_words)
+    for _, doc_id, word_data in ops:
+        if doc_id not in failed_ids:
+            synced[word_data['correctSpelling'].lower()] = {'doc_id': doc_id, 'hash': content_hash(word_data)}
+    try:
+        save_sync_manifest(manifest_path, target, synced)
+    except OSError as e:
+        print(f"⚠️ Warning: Could not save sync manifest {manifest_path}: {e}")
+    
+    if failed:
+        failed_writes = sum(len(chunk) for chunk, _ in failed)
+        print(f"❌ {len(failed)} batches ({failed_writes} writes) failed; rerun to retry them")
         return
+    print(f"✅ Successfully uploaded changes to Firestore!")
     
     # Verify upload
     try:
-        final_count = sum(1 for _ in db.collection('words').stream())
-        print(f"✅ Verification: {final_count} total words in Firestore")
-        
-        expected_total = len(existing_words) + len(new_words)
-        if final_count == expected_total:
-            print("🎉 Upload successful! All changes have been applied.")
-        else:
-            print(f"⚠️ Warning: Expected {expected_total} words, but found {final_count}")
-            
+        verify_upload(db, ops, before_count, len(new_words), spot_check_size)
     except Exception as e:
         print(f"⚠️ Warning: Could not verify upload: {e}")
 
-def _has_changes(new_data, existing_data):
-    """
-    Compare two word data objects to detect changes
-    """
-    # Check if any key fields have changed
-    fields_to_check = ['correctSpelling', 'misspellings', 'definition', 'difficulty']
-    
-    for field in fields_to_check:
-        new_value = new_data.get(field)
-        existing_value = existing_data.get(field)
-        
-        # Handle lists (like misspellings)
-        if isinstance(new_value, list) and isinstance(existing_value, list):
-            if set(new_value) != set(existing_value):
-                return True
-        # Handle other types
-        elif new_value != existing_value:
-            return True
-    
-    return False
-
 def main():
+    parser = argparse.ArgumentParser(description="Upload words_combined.json to Firestore")
+    parser.add_argument('--batch-size', type=int, default=MAX_BATCH_WRITES,
+                        help=f"Writes per batch (at most {MAX_BATCH_WRITES})")
+    parser.add_argument('--parallel', type=int, default=DEFAULT_PARALLEL_BATCHES,
+                        help="Batches committed at the same time")
+    parser.add_argument('--max-retries', type=int, default=DEFAULT_MAX_RETRIES,
+                        help="Retries for a batch that fails with a transient error")
+    parser.add_argument('--emulator', default=None, metavar='HOST:PORT',
+                        help="Use the local Firestore emulator, e.g. localhost:8080")
+    parser.add_argument('--manifest', default=SYNC_MANIFEST_FILE,
+                        help="Local record of the last-synced words, used to diff without reading Firestore")
+    parser.add_argument('--verify-remote', action='store_true',
+                        help="Stream the whole collection and reconcile it with the manifest")
+    parser.add_argument('--upsert', action='store_true',
+                        help="Write word-keyed documents with set(merge=True) instead of update(); "
+                             "needs a sync manifest or --verify-remote")
+    parser.add_argument('--spot-check', type=int, default=DEFAULT_SPOT_CHECK,
+                        help="How many written documents to read back after uploading")
+    parser.add_argument('--migrate-ids', action='store_true',
+                        help="One-time rekey of auto-ID word documents to word-keyed IDs")
+    parser.add_argument('--yes', '-y', action='store_true',
+                        help="Don't ask for confirmation")
+    args = parser.parse_args()
+    
     print("Firebase Word Upload Script")
     print("This script uploads your validated words to Firebase Firestore")
     print()
@@ -192,16 +624,22 @@ def main():
         print("Please install it with: pip install firebase-admin")
         return
     
+    if args.migrate_ids:
+        migrate_document_ids(args.batch_size, args.parallel, args.max_retries, args.yes, args.emulator,
+                             args.manifest)
+        return
+    
     # Confirm before uploading
     print("\nThis script will:")
-    print("- Check for existing words in Firestore")
+    print("- Check for existing words against the local sync manifest")
     print("- Detect changes (new words, updated definitions, etc.)")
     print("- Only upload what has changed")
     print("- Preserve existing words that haven't changed")
     print()
     
     # Upload words
-    upload_words_to_firebase()
+    upload_words_to_firebase(args.batch_size, args.parallel, args.max_retries, args.yes, args.emulator,
+                             args.manifest, args.verify_remote, args.upsert, args.spot_check)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -3,75 +3,57 @@
 Validation script to check that no duplicate words exist between correct spellings and misspellings.
 """
 
+import argparse
 import json
 import os
 
-def validate_no_duplicates(file_path: str) -> bool:
-    """Validate that no misspellings are also correct spellings."""
+from dedup_engine import load_words, scan_words
+
+def validate_no_duplicates(file_path: str, report_path: str = None) -> bool:
+    """Validate that no misspellings are also correct spellings, repeated or duplicated."""
     print(f"🔍 Validating {file_path}...")
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except Exception as e:
-        print(f"❌ Error loading {file_path}: {e}")
-        return False
-    
+
+    data = load_words(file_path)
     words = data.get('words', [])
     if not words:
         print("❌ No words found!")
         return False
-    
-    print(f"📖 Loaded {len(words)} words")
-    
-    # Collect all correct spellings
-    correct_spellings = set()
-    for word in words:
-        correct_spellings.add(word['correctSpelling'].lower())
-    
-    print(f"📝 Found {len(correct_spellings)} unique correct spellings")
-    
-    # Check for duplicates
-    duplicates_found = []
-    total_misspellings = 0
-    
-    for word in words:
-        for misspelling in word['misspellings']:
-            total_misspellings += 1
-            if misspelling.lower() in correct_spellings:
-                duplicates_found.append({
-                    'word': word['correctSpelling'],
-                    'duplicate_misspelling': misspelling
-                })
-    
-    print(f"🔤 Total misspellings checked: {total_misspellings}")
-    
-    if duplicates_found:
-        print(f"❌ Found {len(duplicates_found)} duplicates:")
-        for dup in duplicates_found:
-            print(f"   '{dup['word']}' has misspelling '{dup['duplicate_misspelling']}' which is also a correct spelling")
-        return False
-    else:
+
+    report = scan_words(words)
+    report.print_summary()
+
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"📝 Wrote report to {report_path}")
+
+    if report.is_clean():
         print("✅ No duplicates found! Word list is clean.")
         return True
+    return False
 
 def main():
     """Main validation function."""
+    parser = argparse.ArgumentParser(description="Check a word file for duplicate words and misspellings")
+    parser.add_argument('file', nargs='?', default='assets/data/words_combined.json')
+    parser.add_argument('--report', default=None, help="Write the full report as JSON to this file")
+    args = parser.parse_args()
+
     print("🔍 Word Duplicate Validator")
     print("=" * 40)
-    
-    file_path = 'assets/data/words_combined.json'
-    
+
+    file_path = args.file
+
     if not os.path.exists(file_path):
         print(f"❌ Error: {file_path} not found!")
         return
-    
-    is_valid = validate_no_duplicates(file_path)
-    
+
+    is_valid = validate_no_duplicates(file_path, args.report)
+
     if is_valid:
         print("\n🎉 Validation passed! Your word list is clean.")
     else:
         print("\n⚠️  Validation failed! Duplicates found.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
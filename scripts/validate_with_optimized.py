@@ -1,108 +1,434 @@
+import argparse
 import json
 import os
+import threading
 import time
 import requests
-import random
+import requests.adapters
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
-def check_word_with_api_sync(word, max_retries=3):
+from asset_writer import DEFAULT_WRITER, add_output_arguments, writer_from_args
+from definitions_index import DEFAULT_INDEX_FILE, DefinitionsIndex
+from local_lexicon import load_backend
+from lookup_cache import DEFAULT_CACHE_FILE, DEFAULT_NOT_FOUND_TTL_DAYS, DEFAULT_TTL_DAYS, LookupCache
+
+API_URL = "https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+
+# Documented Free Dictionary API budget: 450 requests per 5 minutes
+RATE_LIMIT_REQUESTS = 450
+RATE_LIMIT_WINDOW = 300
+
+# How many lookups may be in flight at once
+DEFAULT_CONCURRENCY = 4
+
+# Append-only record of every decided word, used by --resume
+CHECKPOINT_FILE = '.cache/validation_checkpoint.jsonl'
+
+class TokenBucket:
     """
-    Synchronous version for compatibility
+    Thread-safe token bucket shared by every validator worker.
+
+    The refill rate is chosen so that a full burst plus a window's worth of
+    refills never exceeds the API budget. A 429 pauses all workers (honouring
+    Retry-After when the server sends it) and halves the rate; successful
+    requests slowly raise it back to the budget. cancel() wakes every
+    waiting worker so an interrupted run does not sit out a pause.
     """
-    url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-    
-    headers = {
+
+    def __init__(self, requests_per_window=RATE_LIMIT_REQUESTS,
+                 window=RATE_LIMIT_WINDOW, burst=10):
+        self.max_rate = (requests_per_window - burst) / window
+        self.rate = self.max_rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.consecutive_429s = 0
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+
+    def acquire(self):
+        """
+        Block until a request may be sent; returns False once cancelled
+        """
+        while not self.cancelled.is_set():
+            with self.lock:
+                now = time.monotonic()
+                if now >= self.paused_until:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return True
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self.paused_until - now
+            self.cancelled.wait(wait)
+        return False
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def throttle(self, retry_after=None):
+        """
+        Back off after a 429 and return how long every worker will pause
+        """
+        with self.lock:
+            self.consecutive_429s += 1
+            if retry_after is None:
+                retry_after = min(RATE_LIMIT_WINDOW, 15 * 2 ** (self.consecutive_429s - 1))
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + retry_after)
+            self.tokens = 0.0
+            self.updated = self.paused_until
+            self.rate = max(self.max_rate / 8, self.rate / 2)
+            return self.paused_until - now
+
+    def record_success(self):
+        with self.lock:
+            self.consecutive_429s = 0
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+class ValidationJournal:
+    """
+    Append-only JSONL checkpoint of validation progress.
+
+    Each verified word is written (and flushed to disk) as soon as it is
+    decided, and a marker is written when a level file has been saved. A
+    resumed run replays the journal so decided words and finished levels
+    cost no API calls.
+    """
+
+    def __init__(self, path=CHECKPOINT_FILE, resume=False):
+        self.path = path
+        self.decided = {}
+        self.completed_levels = set()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if resume and os.path.exists(path):
+            self._replay()
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _replay(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-write
+                    continue
+                if entry.get('completed'):
+                    self.completed_levels.add(entry['level'])
+                else:
+                    self.decided[(entry['level'], entry['word'])] = (entry['valid'], entry['definition'])
+
+    def _append(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def get(self, level, word):
+        return self.decided.get((level, word))
+
+    def record(self, level, word, valid, definition):
+        """
+        Journal a decided word; API errors are left to be retried on resume
+        """
+        if valid is None:
+            return
+        self.decided[(level, word)] = (valid, definition)
+        self._append({"level": level, "word": word, "valid": valid, "definition": definition})
+
+    def complete_level(self, level):
+        self.completed_levels.add(level)
+        self._append({"level": level, "completed": True})
+
+    def finish(self):
+        """
+        Close and delete the journal after a fully successful run
+        """
+        self._file.close()
+        os.remove(self.path)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+def _retry_after_seconds(response):
+    value = response.headers.get('Retry-After')
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+class DictionaryClient:
+    """
+    Pooled keep-alive HTTP client for the dictionary API.
+
+    One client (and its requests.Session) is shared by test_api_connection
+    and every batch worker, so lookups reuse open TCP+TLS connections
+    instead of paying a handshake per word. Requests are paced by the
+    client's token bucket.
+    """
+
+    HEADERS = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'application/json',
         'Accept-Language': 'en-US,en;q=0.9',
     }
-    
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                definition = ""
-                if data and len(data) > 0:
-                    meanings = data[0].get('meanings', [])
-                    if meanings and len(meanings) > 0:
-                        definitions = meanings[0].get('definitions', [])
-                        if definitions and len(definitions) > 0:
-                            definition = definitions[0].get('definition', "")
-                return True, definition
-            elif response.status_code == 404:
-                return False, ""
-            elif response.status_code == 429:
-                print(f"Rate limited (429) for '{word}' - waiting 5 minutes...")
-                time.sleep(300)
-                continue
-            else:
-                if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
-                continue
+
+    def __init__(self, api_url=API_URL, limiter=None, pool_size=DEFAULT_CONCURRENCY,
+                 connect_timeout=5.0, read_timeout=10.0, max_retries=3, backoff_factor=1.0):
+        self.api_url = api_url
+        self.limiter = limiter if limiter is not None else TokenBucket()
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        self.session = requests.Session()
+        self.session.headers.update(self.HEADERS)
+        # pool_block keeps the pool at pool_size connections even if more
+        # workers than that are running
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                                                pool_block=True, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, word):
+        """
+        Return (True, definition), (False, "") for unknown words, or (None, None) on API errors
+        """
+        url = self.api_url.format(word=word)
+        limiter = self.limiter
+        
+        for attempt in range(self.max_retries):
+            try:
+                if not limiter.acquire():
+                    return None, None
+                response = self.session.get(url, timeout=self.timeout)
                 
-        except Exception as e:
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
-            continue
-    
-    return None, None
+                if response.status_code == 200:
+                    limiter.record_success()
+                    data = response.json()
+                    definition = ""
+                    if data and len(data) > 0:
+                        meanings = data[0].get('meanings', [])
+                        if meanings and len(meanings) > 0:
+                            definitions = meanings[0].get('definitions', [])
+                            if definitions and len(definitions) > 0:
+                                definition = definitions[0].get('definition', "")
+                    return True, definition
+                elif response.status_code == 404:
+                    limiter.record_success()
+                    return False, ""
+                elif response.status_code == 429:
+                    pause = limiter.throttle(_retry_after_seconds(response))
+                    print(f"Rate limited (429) for '{word}' - pausing {pause:.0f}s and slowing down...")
+                    continue
+                else:
+                    if attempt < self.max_retries - 1:
+                        limiter.cancelled.wait(self.backoff_factor * 2 ** attempt)
+                    continue
+                    
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    limiter.cancelled.wait(self.backoff_factor * 2 ** attempt)
+                continue
+        
+        return None, None
+
+    def connection_stats(self):
+        """
+        Return (requests sent, connections opened, requests that reused a connection)
+        """
+        sent = opened = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                sent += pool.num_requests
+                opened += pool.num_connections
+        return sent, opened, max(0, sent - opened)
+
+    def close(self):
+        self.session.close()
+
+def check_word_with_api_sync(word, max_retries=3, limiter=None, api_url=API_URL, client=None):
+    """
+    Synchronous version for compatibility
+    """
+    if client is not None:
+        return client.lookup(word)
+    with DictionaryClient(api_url, limiter, pool_size=1, max_retries=max_retries) as client:
+        return client.lookup(word)
 
 
 
-def process_batch_optimized(words_batch, batch_num, total_batches):
+def process_batch_optimized(words_batch, batch_num, total_batches, limiter=None,
+                            concurrency=DEFAULT_CONCURRENCY, api_url=API_URL, cache=None,
+                            journal=None, level=None, client=None, backend=None, offline=False,
+                            definitions=None):
     """
-    Process a batch of words with optimized sequential processing
+    Process a batch of words with several lookups in flight under a shared rate limit
+
+    Words already decided in the checkpoint journal, found in the local
+    backend with a definition, or with a fresh entry in the lookup cache are
+    answered without an API call. In offline mode the local backend decides
+    every word. A local hit without a definition is looked up only for its
+    definition: it stays valid even if the API or cache says otherwise.
+    Every newly decided word is journaled as soon as it is known.
+    Definitions from the local definitions index take priority; the API only
+    fills the gaps.
     """
     print(f"\n--- Processing Batch {batch_num}/{total_batches} ({len(words_batch)} words) ---")
     
+    owns_client = client is None and not offline
+    if owns_client:
+        client = DictionaryClient(api_url, limiter, pool_size=concurrency)
+    
     valid_words = []
     invalid_words = []
     api_errors = []
+    results = {}
     
-    for i, word_obj in enumerate(words_batch):
-        word = word_obj.get('correctSpelling', '').lower()
-        
-        if not word:
-            continue
+    # One local batch join for the whole batch instead of a fetch per word
+    indexed = {}
+    if definitions is not None:
+        indexed = definitions.lookup_many(
+            w.get('correctSpelling', '') for w in words_batch if w.get('correctSpelling')
+        )
+    
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    interrupted = False
+    try:
+        futures = {}
+        resumed = 0
+        local = 0
+        # Words the local backend accepted that are only looked up for a
+        # definition; the API never overrules the local verdict for these
+        known_locally = set()
+        for i, word_obj in enumerate(words_batch):
+            word = word_obj.get('correctSpelling', '').lower()
+            
+            if not word:
+                continue
+            
+            decided = journal.get(level, word) if journal is not None else None
+            if decided is not None:
+                results[i] = decided
+                resumed += 1
+                continue
+            
+            if backend is not None:
+                existing_definition = word_obj.get('definition') or indexed.get(word, "")
+                known = backend.contains(word)
+                # A local hit only needs the API when it still lacks a definition
+                if offline or (known and existing_definition):
+                    results[i] = (True, existing_definition) if known else (False, "")
+                    local += 1
+                    if journal is not None:
+                        journal.record(level, word, *results[i])
+                    continue
+                if known:
+                    known_locally.add(i)
+            
+            cached = cache.get(word) if cache is not None else None
+            if cached is not None:
+                results[i] = (True, cached[1] or "") if i in known_locally else cached
+                if journal is not None:
+                    journal.record(level, word, *results[i])
+                continue
+            
+            future = executor.submit(client.lookup, word)
+            futures[future] = (i, word)
         
-        print(f"[{batch_num}/{total_batches}] {i+1}/{len(words_batch)}: {word}", end=" ")
+        if resumed:
+            print(f"[{batch_num}/{total_batches}] {resumed} words already decided in the checkpoint")
+        if local:
+            print(f"[{batch_num}/{total_batches}] {local} words decided by the local dictionary")
+        if len(results) > resumed + local:
+            print(f"[{batch_num}/{total_batches}] {len(results) - resumed - local} words answered from the lookup cache")
         
-        # Check with API
-        result, definition = check_word_with_api_sync(word)
+        for done, future in enumerate(as_completed(futures), 1):
+            i, word = futures[future]
+            result, definition = future.result()
+            if cache is not None:
+                cache.put(word, result, definition)
+            if i in known_locally:
+                result, definition = True, definition or ""
+            results[i] = (result, definition)
+            if journal is not None:
+                journal.record(level, word, result, definition)
+            
+            if result is True:
+                print(f"[{batch_num}/{total_batches}] {done}/{len(futures)}: {word} ✓ Valid - {definition[:40]}{'...' if len(definition) > 40 else ''}")
+            elif result is False:
+                print(f"[{batch_num}/{total_batches}] {done}/{len(futures)}: {word} ✗ Invalid")
+            else:
+                print(f"[{batch_num}/{total_batches}] {done}/{len(futures)}: {word} ? API Error (keeping word)")
+    except KeyboardInterrupt:
+        # Drop queued lookups and wake workers waiting on the rate limit
+        # instead of waiting for the whole batch
+        interrupted = True
+        if client is not None:
+            client.limiter.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        if not interrupted:
+            executor.shutdown()
+        if owns_client:
+            client.close()
+    
+    # Collect in the original order so output files stay stable
+    for i, word_obj in enumerate(words_batch):
+        if i not in results:
+            continue
+        result, definition = results[i]
+        word = word_obj.get('correctSpelling', '').lower()
         
         if result is True:
-            word_obj["definition"] = definition
+            word_obj["definition"] = indexed.get(word) or definition
             valid_words.append(word_obj)
-            print(f"✓ Valid - {definition[:40]}{'...' if len(definition) > 40 else ''}")
         elif result is False:
             invalid_words.append(word)
-            print("✗ Invalid")
         else:
             api_errors.append(word)
-            print("? API Error (keeping word)")
-        
-        # Optimized rate limiting - stay just under the limit
-        # 450 requests per 5 minutes = 90 per minute = 1.5 per second
-        # We'll use 0.8 seconds to stay safely under the limit
-        delay = 0.8 + random.uniform(0, 0.2)  # 0.8-1.0 second delay
-        time.sleep(delay)
     
     return valid_words, invalid_words, api_errors
 
 
 
-def validate_words_optimized():
+def validate_words_optimized(concurrency=DEFAULT_CONCURRENCY, api_url=API_URL, cache=None,
+                             journal=None, client=None, backend=None, offline=False,
+                             definitions=None, writer=DEFAULT_WRITER):
     """
-    Optimized validation using sequential processing with smart rate limiting
+    Optimized validation using concurrent lookups under a shared token bucket
+
+    With a journal, progress is checkpointed word by word and levels already
+    saved by an interrupted run are skipped.
     """
-    print("Starting Free Dictionary API validation with optimized sequential processing...")
+    print("Starting Free Dictionary API validation with concurrent processing...")
     print("This will check each word against a real dictionary API")
     print("Rate limit: 450 requests per 5 minutes")
-    print("Using optimized sequential processing for maximum reliability")
+    print(f"Using up to {concurrency} requests in flight under a shared rate limit")
     print()
     
+    # One pooled client and token bucket for the whole run, so connections
+    # are reused and the budget holds across batches and levels
+    owns_client = client is None and not offline
+    if owns_client:
+        client = DictionaryClient(api_url, pool_size=concurrency)
+    
     # Process each level file
     for level in range(1, 6):
         filename = f'assets/data/words_level{level}.json'
@@ -111,6 +437,10 @@ def validate_words_optimized():
             print(f"Warning: {filename} not found, skipping...")
             continue
         
+        if journal is not None and level in journal.completed_levels:
+            print(f"\n=== Level {level} already validated (checkpoint), skipping ===")
+            continue
+        
         print(f"\n=== Processing Level {level} ===")
         
         # Load the level file
@@ -124,8 +454,18 @@ def validate_words_optimized():
         
         print(f"Loaded {len(words)} words from {filename}")
         
-        # Optimized batch size - smaller batches for better rate limit management
-        batch_size = 100  # Larger batches since we're not using concurrency
+        # Back up the level before validation fills in definitions. Levels
+        # finished by an interrupted run were skipped above, so this file
+        # still holds the unvalidated words.
+        backup_filename = f'assets/data/words_level{level}_backup.json'
+        try:
+            writer.write_json(backup_filename, data, compress=())
+            print(f"  Original file backed up to {backup_filename}")
+        except Exception as e:
+            print(f"  Warning: Could not create backup: {e}")
+        
+        # Batches only group progress output; the token bucket does the pacing
+        batch_size = 100
         batches = [words[i:i + batch_size] for i in range(0, len(words), batch_size)]
         total_batches = len(batches)
         
@@ -139,7 +479,9 @@ def validate_words_optimized():
             start_time = datetime.now()
             
             valid_words, invalid_words, api_errors = process_batch_optimized(
-                words_batch, batch_num, total_batches
+                words_batch, batch_num, total_batches, client.limiter if client else None,
+                concurrency, api_url, cache, journal, level, client, backend, offline,
+                definitions
             )
             
             all_valid_words.extend(valid_words)
@@ -151,12 +493,6 @@ def validate_words_optimized():
             
             print(f"\nBatch {batch_num} completed in {batch_duration}")
             print(f"  Valid: {len(valid_words)}, Invalid: {len(invalid_words)}, Errors: {len(api_errors)}")
-            
-            # Short break between batches
-            if batch_num < total_batches:
-                wait_time = 3  # 3 second break between batches
-                print(f"Waiting {wait_time} seconds before next batch...")
-                time.sleep(wait_time)
         
         print(f"\nLevel {level} Final Results:")
         print(f"  Valid words: {len(all_valid_words)}")
@@ -179,20 +515,12 @@ def validate_words_optimized():
             "api_errors": len(all_api_errors)
         }
         
-        # Create backup of original file
-        backup_filename = f'assets/data/words_level{level}_backup.json'
-        try:
-            with open(backup_filename, 'w') as f:
-                json.dump(data, f, indent=2)
-            print(f"  Original file backed up to {backup_filename}")
-        except Exception as e:
-            print(f"  Warning: Could not create backup: {e}")
-        
         # Save validated file
         try:
-            with open(filename, 'w') as f:
-                json.dump(validated_data, f, indent=2)
+            writer.write_json(filename, validated_data)
             print(f"  Updated {filename} with {len(all_valid_words)} valid words")
+            if journal is not None:
+                journal.complete_level(level)
         except Exception as e:
             print(f"  Error saving {filename}: {e}")
     
@@ -216,22 +544,30 @@ def validate_words_optimized():
     }
     
     try:
-        with open('assets/data/words_combined.json', 'w') as f:
-            json.dump(combined_data, f, indent=2)
+        writer.write_json('assets/data/words_combined.json', combined_data)
         print(f"Updated combined file with {len(all_words)} total words")
     except Exception as e:
         print(f"Error saving combined file: {e}")
     
+    if cache is not None:
+        print(f"Lookup cache: {cache.hits} hits, {cache.misses} API lookups")
+    
+    if client is not None:
+        sent, opened, reused = client.connection_stats()
+        print(f"HTTP: {sent} requests over {opened} connections ({reused} reused a kept-alive connection)")
+    if owns_client:
+        client.close()
+    
     print("\nValidation complete!")
 
-def test_api_connection():
+def test_api_connection(api_url=API_URL, client=None):
     """
     Test the API connection with a known word
     """
     print("Testing API connection...")
     
     test_word = "hello"
-    result, definition = check_word_with_api_sync(test_word)
+    result, definition = check_word_with_api_sync(test_word, api_url=api_url, client=client)
     
     if result is True:
         print(f"✓ API working - '{test_word}' is valid")
@@ -245,11 +581,49 @@ def test_api_connection():
         return False
 
 def main():
+    parser = argparse.ArgumentParser(description="Validate level words and fetch definitions")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help="Maximum number of API requests in flight")
+    parser.add_argument('--api-url', default=API_URL,
+                        help="Lookup URL template with a {word} placeholder (e.g. a local stand-in server)")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_FILE,
+                        help="SQLite file caching lookups between runs")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Query the API for every word")
+    parser.add_argument('--cache-ttl-days', type=float, default=DEFAULT_TTL_DAYS,
+                        help="How long a found word stays cached")
+    parser.add_argument('--not-found-ttl-days', type=float, default=DEFAULT_NOT_FOUND_TTL_DAYS,
+                        help="How long a 404 stays cached")
+    parser.add_argument('--pool-size', type=int, default=None,
+                        help="Kept-alive HTTP connections (defaults to --concurrency)")
+    parser.add_argument('--connect-timeout', type=float, default=5.0,
+                        help="Seconds to wait for a connection")
+    parser.add_argument('--read-timeout', type=float, default=10.0,
+                        help="Seconds to wait for a response")
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help="Attempts per word before it counts as an API error")
+    parser.add_argument('--backoff', type=float, default=1.0,
+                        help="Base delay for exponential backoff between retries")
+    parser.add_argument('--local-dictionary', default=None,
+                        help="Word list (JSON/text/gzip) or Hunspell .dic checked before the API")
+    parser.add_argument('--definitions-index', default=None, nargs='?', const=DEFAULT_INDEX_FILE,
+                        help="Local definitions index (see definitions_index.py build) used before the API")
+    parser.add_argument('--offline', action='store_true',
+                        help="Decide every word from --local-dictionary without any API calls")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an interrupted run from its checkpoint journal")
+    parser.add_argument('--checkpoint', default=CHECKPOINT_FILE,
+                        help="Checkpoint journal written as each word is decided")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    if args.offline and not args.local_dictionary:
+        parser.error("--offline requires --local-dictionary")
+    
     print("Free Dictionary API Word Validator & Definition Fetcher (Optimized Version)")
     print("This script uses the Free Dictionary API to validate words AND get definitions")
     print("API: https://api.dictionaryapi.dev/")
     print("Rate limit: 450 requests per 5 minutes")
-    print("Features: Optimized sequential processing, smart rate limiting, maximum reliability")
+    print("Features: Concurrent lookups, token-bucket rate limiting, adaptive 429 backoff")
     print()
     
     # Check if requests is available
@@ -261,10 +635,39 @@ def main():
         print("Please install it with: pip install requests")
         return
     
-    # Test API connection first
-    if not test_api_connection():
-        print("API connection failed. Please check your internet connection.")
-        return
+    backend = None
+    if args.local_dictionary:
+        if not os.path.exists(args.local_dictionary):
+            print(f"✗ Local dictionary {args.local_dictionary} not found!")
+            return
+        backend = load_backend(args.local_dictionary)
+        print(f"✓ Loaded {len(backend)} entries from local dictionary {args.local_dictionary}")
+    
+    definitions = None
+    if args.definitions_index:
+        if not os.path.exists(args.definitions_index):
+            print(f"✗ Definitions index {args.definitions_index} not found!")
+            print("Build it with: python scripts/definitions_index.py build <dump files>")
+            return
+        definitions = DefinitionsIndex(args.definitions_index)
+        print(f"✓ Loaded definitions index {args.definitions_index} ({len(definitions)} words)")
+    
+    client = None
+    if not args.offline:
+        # One pooled client shared by the connection test and every batch worker
+        client = DictionaryClient(
+            args.api_url,
+            pool_size=args.pool_size or args.concurrency,
+            connect_timeout=args.connect_timeout,
+            read_timeout=args.read_timeout,
+            max_retries=args.max_retries,
+            backoff_factor=args.backoff,
+        )
+        
+        # Test API connection first
+        if not test_api_connection(args.api_url, client):
+            print("API connection failed. Please check your internet connection.")
+            return
     
     # Check if level files exist
     files_exist = False
@@ -283,13 +686,17 @@ def main():
     print()
     
     # Confirm before starting
-    print("This will make API calls for each word in your files.")
-    print("With 500 words per level, this will be ~2,500 API calls.")
+    if args.offline:
+        print("Offline mode: words are checked against the local dictionary only.")
+    elif backend is not None:
+        print("Words found locally with a definition skip the API; only misses and missing definitions are looked up.")
+    else:
+        print("This will make API calls for each word in your files.")
+    print("With 500 words per level, this will be ~2,500 lookups.")
     print("The API has a limit of 450 requests per 5 minutes.")
     print("Each valid word will also get its definition from the dictionary!")
-    print("Using optimized sequential processing for maximum reliability.")
-    print("Processing in batches of 100 words with 0.8-1.0 second delays.")
-    print("Total processing time: approximately 1.5-2 hours (reliable and efficient).")
+    print(f"Using up to {args.concurrency} concurrent requests paced by a shared token bucket.")
+    print("Total processing time: approximately 30 minutes (bounded by the rate limit).")
     print()
     
     response = input("Continue? (y/n): ").lower().strip()
@@ -298,7 +705,30 @@ def main():
         return
     
     # Start validation
-    validate_words_optimized()
+    cache = None
+    if not args.no_cache:
+        cache = LookupCache(args.cache, args.cache_ttl_days, args.not_found_ttl_days)
+        expired = cache.purge_expired()
+        print(f"Using lookup cache {args.cache} ({expired} expired entries purged)")
+    
+    journal = ValidationJournal(args.checkpoint, resume=args.resume)
+    if args.resume:
+        print(f"Resuming: {len(journal.decided)} words and {len(journal.completed_levels)} levels already done")
+    
+    try:
+        validate_words_optimized(args.concurrency, args.api_url, cache, journal, client,
+                                 backend, args.offline, definitions, writer_from_args(args))
+        journal.finish()
+    except KeyboardInterrupt:
+        print(f"\nInterrupted. Progress is saved in {args.checkpoint}; rerun with --resume to continue.")
+    finally:
+        journal.close()
+        if client is not None:
+            client.close()
+        if definitions is not None:
+            definitions.close()
+        if cache is not None:
+            cache.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Compact binary word pack: every level file plus the combined ordering in one
+asset that is much smaller and cheaper to parse than the JSON files.
+
+Layout (all integers are unsigned LEB128 varints):
+
+    magic b'MSPK', format version (1 byte)
+    string table: count, then (byte length, UTF-8 bytes) per string
+    level index:  count, then (level, first record, record count,
+                  byte offset of the first record) per level
+    records:      byte length of the section, then per word:
+                  correctSpelling string, difficulty, definition string,
+                  misspelling count, misspelling strings
+    combined:     count, then one record number per word
+
+Every distinct string is stored once and records refer to it by position,
+and the level index lets a reader decode one level without the others.
+
+The app does not read the pack yet, so it is built into .cache/ on demand
+rather than into the bundled assets/data/, where every script that rewrites
+the JSON files would leave it stale. Build it from the current JSON with
+`word_pack.py build`.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from asset_writer import DEFAULT_WRITER, add_output_arguments, writer_from_args
+
+MAGIC = b'MSPK'
+VERSION = 1
+
+PACK_FILE = '.cache/words.pack'
+LEVELS = range(1, 6)
+LEVEL_FILE = 'assets/data/words_level{level}.json'
+COMBINED_FILE = 'assets/data/words_combined.json'
+
+def write_varint(out, value):
+    if value < 0:
+        raise ValueError(f"varints must be non-negative, got {value}")
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    """
+    Return (value, new position)
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+
+    def add(self, text):
+        return self.index.setdefault(text, len(self.index))
+
+def encode_word_pack(levels, combined):
+    """
+    Encode {level: [word objects]} and the combined list into pack bytes.
+
+    Every combined entry must also appear in one of the levels; the pack
+    stores it once and the combined section only records its position.
+    """
+    strings = _StringTable()
+    records = bytearray()
+    level_index = []
+    record_numbers = {}
+    count = 0
+
+    for level in sorted(levels):
+        start, offset = count, len(records)
+        for word in levels[level]:
+            write_varint(records, strings.add(word['correctSpelling']))
+            write_varint(records, word.get('difficulty', level))
+            write_varint(records, strings.add(word.get('definition', '')))
+            write_varint(records, len(word['misspellings']))
+            for misspelling in word['misspellings']:
+                write_varint(records, strings.add(misspelling))
+            record_numbers.setdefault(word['correctSpelling'].lower(), count)
+            count += 1
+        level_index.append((level, start, count - start, offset))
+
+    order = []
+    for word in combined:
+        number = record_numbers.get(word['correctSpelling'].lower())
+        if number is None:
+            raise ValueError(f"'{word['correctSpelling']}' is in the combined list but in no level")
+        order.append(number)
+
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    write_varint(out, len(strings.index))
+    for text in strings.index:
+        encoded = text.encode('utf-8')
+        write_varint(out, len(encoded))
+        out += encoded
+    write_varint(out, len(level_index))
+    for entry in level_index:
+        for value in entry:
+            write_varint(out, value)
+    write_varint(out, len(records))
+    out += records
+    write_varint(out, len(order))
+    for number in order:
+        write_varint(out, number)
+    return bytes(out)
+
+class WordPack:
+    """
+    Lazy reader over pack bytes; levels are decoded on demand
+    """
+
+    def __init__(self, data):
+        if data[:4] != MAGIC:
+            raise ValueError("Not a word pack")
+        if data[4] != VERSION:
+            raise ValueError(f"Unsupported word pack version {data[4]}")
+        self.data = data
+        pos = 5
+
+        count, pos = read_varint(data, pos)
+        self.strings = []
+        for _ in range(count):
+            length, pos = read_varint(data, pos)
+            self.strings.append(data[pos:pos + length].decode('utf-8'))
+            pos += length
+
+        count, pos = read_varint(data, pos)
+        # level -> (first record, record count, byte offset)
+        self.level_index = {}
+        for _ in range(count):
+            level, pos = read_varint(data, pos)
+            start, pos = read_varint(data, pos)
+            size, pos = read_varint(data, pos)
+            offset, pos = read_varint(data, pos)
+            self.level_index[level] = (start, size, offset)
+
+        length, pos = read_varint(data, pos)
+        self._records_start = pos
+        pos += length
+
+        count, pos = read_varint(data, pos)
+        self.combined_order = []
+        for _ in range(count):
+            number, pos = read_varint(data, pos)
+            self.combined_order.append(number)
+
+    @classmethod
+    def from_file(cls, path=PACK_FILE):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    @property
+    def levels(self):
+        return sorted(self.level_index)
+
+    def level(self, level):
+        """
+        Decode the word objects of one level
+        """
+        _, size, offset = self.level_index[level]
+        data, strings = self.data, self.strings
+        pos = self._records_start + offset
+        words = []
+        for _ in range(size):
+            correct, pos = read_varint(data, pos)
+            difficulty, pos = read_varint(data, pos)
+            definition, pos = read_varint(data, pos)
+            count, pos = read_varint(data, pos)
+            misspellings = []
+            for _ in range(count):
+                index, pos = read_varint(data, pos)
+                misspellings.append(strings[index])
+            words.append({
+                "correctSpelling": strings[correct],
+                "misspellings": misspellings,
+                "difficulty": difficulty,
+                "definition": strings[definition],
+            })
+        return words
+
+    def combined(self):
+        """
+        Decode every word in the combined file's order
+        """
+        records = []
+        for level in self.levels:
+            records.extend(self.level(level))
+        return [records[number] for number in self.combined_order]
+
+def write_word_pack(levels, combined, path=PACK_FILE, writer=DEFAULT_WRITER):
+    """
+    Encode and write a pack; returns its size in bytes
+    """
+    return writer.write_bytes(path, encode_word_pack(levels, combined))
+
+def load_json_assets():
+    levels = {}
+    for level in LEVELS:
+        with open(LEVEL_FILE.format(level=level), 'r', encoding='utf-8') as f:
+            levels[level] = json.load(f).get('words', [])
+    with open(COMBINED_FILE, 'r', encoding='utf-8') as f:
+        combined = json.load(f).get('words', [])
+    return levels, combined
+
+def _comparable(word):
+    return {
+        "correctSpelling": word['correctSpelling'],
+        "misspellings": list(word['misspellings']),
+        "difficulty": word.get('difficulty'),
+        "definition": word.get('definition', ''),
+    }
+
+def _by_word(levels, combined):
+    # The level entry for each combined entry, or the entry itself if missing
+    index = {}
+    for words in levels.values():
+        for word in words:
+            index.setdefault(word['correctSpelling'].lower(), word)
+    return [index.get(word['correctSpelling'].lower(), word) for word in combined]
+
+def verify_round_trip(pack, levels, combined):
+    """
+    Return a list of differences between a decoded pack and the JSON word lists
+    """
+    problems = []
+    for level, words in levels.items():
+        if level not in pack.level_index:
+            problems.append(f"level {level} is missing from the pack")
+        elif pack.level(level) != [_comparable(word) for word in words]:
+            problems.append(f"level {level} differs from the JSON")
+    if pack.combined() != [_comparable(word) for word in combined]:
+        problems.append("combined order or contents differ from the JSON")
+    return problems
+
+def build(args):
+    try:
+        levels, combined = load_json_assets()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error loading the JSON assets: {e}")
+        sys.exit(1)
+    # The pack stores each word once, so both sides have to agree first
+    if any(_comparable(word) != _comparable(packed)
+           for word, packed in zip(combined, _by_word(levels, combined))):
+        print("❌ The level files and the combined file disagree;")
+        print("   run scripts/check_consistency.py --repair first")
+        sys.exit(1)
+    try:
+        size = write_word_pack(levels, combined, args.pack, writer_from_args(args))
+    except (OSError, ValueError) as e:
+        print(f"❌ Error building {args.pack}: {e}")
+        sys.exit(1)
+    json_size = sum(os.path.getsize(LEVEL_FILE.format(level=level)) for level in LEVELS)
+    json_size += os.path.getsize(COMBINED_FILE)
+    print(f"✅ Wrote {args.pack}: {size} bytes ({json_size} bytes of JSON)")
+
+def verify(args):
+    levels, combined = load_json_assets()
+    problems = verify_round_trip(WordPack.from_file(args.pack), levels, combined)
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print(f"✅ {args.pack} matches the JSON assets")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or verify the binary word pack asset")
+    parser.add_argument('--pack', default=PACK_FILE, help="Word pack file")
+    add_output_arguments(parser)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('build', help="Pack the level and combined JSON files").set_defaults(func=build)
+    subparsers.add_parser('verify', help="Check the pack round-trips to the JSON files").set_defaults(func=verify)
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()